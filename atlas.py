@@ -0,0 +1,131 @@
+import pygame
+
+
+# ===============================
+# TEXTURE ATLAS
+# ===============================
+
+class TextureAtlas:
+    """
+    Packs sprite frames into a few large SRCALPHA pages (shelf packing).
+    A frame becomes a region: (page surface, area rect). Blit a region with
+    target.blit(page, dest, area) or, better, queue it in a SpriteBatch.
+
+    Surfaces and frame lists are registered once, keyed by object (the
+    sprites caches share them), and must be treated as read-only. Pack on
+    the main thread only.
+    """
+
+    def __init__(self, page_size=(1024, 1024), padding=1):
+        self.page_size = page_size
+        self.padding = padding
+        self.pages = []
+        self._cursor = None  # (x, y, shelf_height) on the last page
+        self._lists = {}     # id(frame list) -> (frame list, regions)
+        self._regions = {}   # id(surface) -> (surface, region)
+        self.frames_packed = 0
+
+    def _new_page(self, size):
+        page = pygame.Surface(size, pygame.SRCALPHA).convert_alpha()
+        page.fill((0, 0, 0, 0))
+        self.pages.append(page)
+        return page
+
+    def add(self, surface):
+        """Copy one surface into the atlas; returns its (page, area) region."""
+        w, h = surface.get_size()
+        pad = self.padding
+        page_w, page_h = self.page_size
+
+        if w + pad > page_w or h + pad > page_h:
+            # too big to share a page
+            page = self._new_page((w, h))
+            self._cursor = None
+            area = pygame.Rect(0, 0, w, h)
+        else:
+            if self._cursor is None:
+                self._new_page(self.page_size)
+                self._cursor = (0, 0, 0)
+            x, y, shelf_h = self._cursor
+            if x + w > page_w:
+                x, y, shelf_h = 0, y + shelf_h + pad, 0
+            if y + h > page_h:
+                self._new_page(self.page_size)
+                x, y, shelf_h = 0, 0, 0
+            page = self.pages[-1]
+            area = pygame.Rect(x, y, w, h)
+            self._cursor = (x + w + pad, y, max(shelf_h, h))
+
+        # RGBA_MAX onto a cleared page copies pixels without alpha blending
+        page.blit(surface, area, special_flags=pygame.BLEND_RGBA_MAX)
+        self.frames_packed += 1
+        return page, area
+
+    def region(self, surface):
+        """Region for a shared surface (packed on first use)."""
+        entry = self._regions.get(id(surface))
+        if entry is None:
+            # keep a reference so the id can't be reused
+            entry = self._regions[id(surface)] = (surface, self.add(surface))
+        return entry[1]
+
+    def frames(self, frames) -> list:
+        """Regions for a shared frame list (packed on first use)."""
+        entry = self._lists.get(id(frames))
+        if entry is None:
+            entry = self._lists[id(frames)] = (frames, [self.region(f) for f in frames])
+        return entry[1]
+
+    def stats(self) -> dict:
+        page_px = sum(p.get_width() * p.get_height() for p in self.pages)
+        used_px = sum(area.w * area.h for _, (_, area) in self._regions.values())
+        return {
+            "pages": len(self.pages),
+            "frame_lists": len(self._lists),
+            "frames": self.frames_packed,
+            "fill": used_px / page_px if page_px else 0.0,
+        }
+
+    def clear(self):
+        self.pages.clear()
+        self._lists.clear()
+        self._regions.clear()
+        self._cursor = None
+        self.frames_packed = 0
+
+
+# ===============================
+# SPRITE BATCH
+# ===============================
+
+class SpriteBatch:
+    """
+    Blits queued for a single Surface.blits() call (one per draw layer).
+    add() returns the destination rect (unclipped), for dirty-rect tracking.
+    """
+
+    def __init__(self):
+        self.items = []
+
+    def add(self, source, dest, area=None) -> pygame.Rect:
+        """dest is a position or a Rect (only its topleft is used)."""
+        if area is None:
+            self.items.append((source, dest))
+            w, h = source.get_size()
+        else:
+            self.items.append((source, dest, area))
+            w, h = area.size
+        return pygame.Rect(dest[0], dest[1], w, h)
+
+    def add_region(self, region, dest) -> pygame.Rect:
+        page, area = region
+        return self.add(page, dest, area)
+
+    def flush(self, target):
+        if self.items:
+            target.blits(self.items, False)
+            self.items.clear()
+
+
+# shared instance used by the game
+atlas = TextureAtlas()
@@ -0,0 +1,55 @@
+import pygame
+
+import sprites
+
+
+FLOOR_TILE = "assets/bg/floor.png"
+FLOOR_SCALE = 5
+
+
+def load_floor_tile() -> pygame.Surface:
+    """The floor tile at FLOOR_SCALE (from the bake when it is fresh, see bake.py)."""
+    return sprites.load_frames(FLOOR_TILE, 1, 1, scale=FLOOR_SCALE)[0]
+
+
+# -------------------------
+# Scrolling floor background
+# -------------------------
+class ScrollingBackground:
+    """
+    The floor tile pre-tiled onto one surface that is a tile larger than
+    the window in each direction. Scrolling is a single blit with a source
+    area picked from the camera offset.
+    Call rebuild() when the window size changes (VIDEORESIZE).
+    """
+
+    def __init__(self, tile: pygame.Surface, width, height, scale=5):
+        tw, th = tile.get_size()
+        self.tile = tile if scale == 1 else pygame.transform.scale(tile, (tw * scale, th * scale))
+        self.surface = None
+        self.view_size = (0, 0)
+        self.offset = (0, 0)  # pixel scroll of the last draw(), mod tile size
+        self.rebuild(width, height)
+
+    def rebuild(self, width, height):
+        tw, th = self.tile.get_size()
+        cols = -(-width // tw) + 1
+        rows = -(-height // th) + 1
+
+        surface = pygame.Surface((cols * tw, rows * th)).convert()
+        for cx in range(cols):
+            for cy in range(rows):
+                surface.blit(self.tile, (cx * tw, cy * th))
+
+        self.surface = surface
+        self.view_size = (width, height)
+
+    def draw(self, target, camera_x=0.0, camera_y=0.0):
+        """Fill target with the floor as seen from the camera offset."""
+        tw, th = self.tile.get_size()
+        offset_x = int((-camera_x) % tw)
+        offset_y = int((-camera_y) % th)
+        self.offset = (offset_x, offset_y)
+
+        area = pygame.Rect((tw - offset_x) % tw, (th - offset_y) % th, *self.view_size)
+        target.blit(self.surface, (0, 0), area)
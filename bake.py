@@ -0,0 +1,151 @@
+"""
+Offline asset bake: pre-scaled frame sheets + a metrics manifest.
+
+    python bake.py            # (re)write assets/baked/
+    python bake.py --check    # exit 1 if the bake is missing or stale
+
+At runtime sprites.load_frames() / spritemetrics.sheet_metrics() use a
+baked sheet when its manifest entry matches the source image's sha256,
+and process the source live otherwise.
+
+Baked: every load_frames() sheet (powerups, HUD icons, skin walk sheets)
+and the floor tile. Not baked: the snowball rotation tables (one per
+radius, rotated from a smoothscaled image), still built at startup by
+SnowballField.warm_up(); radii and animation timings stay code constants.
+"""
+import argparse
+import json
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+import sprites
+import spritemetrics
+from background import FLOOR_TILE, FLOOR_SCALE
+from player import SKINS, SKIN_SHEETS, SKIN_FRAME_SIZE, SKIN_FRAMES_PER_SHEET, SHADOW_ALPHA_THRESHOLD
+
+
+# ===============================
+# WHAT TO BAKE
+# ===============================
+
+# (path, cols, rows, scale, frame_size) -- same arguments as the game's
+# sprites.load_frames() calls
+BAKE_SHEETS = [
+    ("assets/powerups/fishy.png", 3, 3, 1.5, None),        # FishPowerUp, HUD icon
+    ("assets/powerups/pebble.png", 3, 3, 2.5, None),       # Pebble
+    ("assets/powerups/pebble.png", 3, 3, 2.0, None),       # HUD icon
+    ("assets/powerups/shovel.png", 3, 3, 2, (32, 32)),     # ShovelPowerUp
+    (FLOOR_TILE, 1, 1, FLOOR_SCALE, None),                 # ScrollingBackground tile
+]
+
+METRIC_THRESHOLDS = (0, SHADOW_ALPHA_THRESHOLD)
+
+
+def all_sheets():
+    sheets = list(BAKE_SHEETS)
+    for skin, cfg in SKINS.items():
+        for filename in SKIN_SHEETS.values():
+            sheets.append((
+                f"assets/animations/{skin}/{filename}",
+                SKIN_FRAMES_PER_SHEET, 1, cfg["scale"], SKIN_FRAME_SIZE
+            ))
+    return sheets
+
+
+def baked_name(path, cols, rows, scale, frame_size):
+    stem = os.path.splitext(path[len("assets/"):])[0].replace("/", "_")
+    return f"{stem}_{cols}x{rows}@{scale:g}.png"
+
+
+# ===============================
+# BAKE
+# ===============================
+
+def bake_sheet(out_dir, path, cols, rows, scale, frame_size):
+    frames = sprites.load_frames(path, cols, rows, scale=scale, frame_size=frame_size)
+    fw, fh = frames[0].get_size()
+
+    sheet = pygame.Surface((cols * fw, rows * fh), pygame.SRCALPHA)
+    rects = []
+    for i, frame in enumerate(frames):
+        rect = pygame.Rect((i % cols) * fw, (i // cols) * fh, fw, fh)
+        # RGBA_MAX onto a cleared sheet copies pixels without alpha blending
+        sheet.blit(frame, rect, special_flags=pygame.BLEND_RGBA_MAX)
+        rects.append(list(rect))
+
+    name = baked_name(path, cols, rows, scale, frame_size)
+    pygame.image.save(sheet, os.path.join(out_dir, name))
+
+    return {
+        "source": path,
+        "sha256": sprites.source_hash(path),
+        "image": name,
+        "frames": rects,
+        "metrics": {
+            str(t): spritemetrics.encode_metrics(spritemetrics.measure_frames(frames, t))
+            for t in METRIC_THRESHOLDS
+        },
+    }
+
+
+def bake(out_dir=sprites.BAKED_DIR):
+    # always measure the real sources, never a previous bake
+    sprites.USE_BAKED = False
+    os.makedirs(out_dir, exist_ok=True)
+
+    entries = {}
+    for spec in all_sheets():
+        entries[sprites.bake_key(*spec)] = bake_sheet(out_dir, *spec)
+
+    # drop sheets from older bakes
+    keep = {e["image"] for e in entries.values()}
+    for name in os.listdir(out_dir):
+        if name.endswith(".png") and name not in keep:
+            os.remove(os.path.join(out_dir, name))
+
+    manifest = {"version": sprites.MANIFEST_VERSION, "sheets": entries}
+    with open(os.path.join(out_dir, sprites.MANIFEST_FILE), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1)
+    return entries
+
+
+def check():
+    """Names of sheets whose bake is missing or older than the source."""
+    manifest = sprites.load_manifest()
+    problems = []
+    for spec in all_sheets():
+        entry = manifest.get(sprites.bake_key(*spec))
+        if entry is None:
+            problems.append(f"missing: {spec[0]} @ {spec[3]:g}")
+        elif sprites.baked_entry(*spec) is None:
+            problems.append(f"stale:   {spec[0]} @ {spec[3]:g}")
+    return problems
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Bake pre-scaled sprite sheets + manifest")
+    parser.add_argument("--check", action="store_true", help="only report a missing / stale bake")
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    pygame.display.set_mode((1, 1))  # convert_alpha() needs a display
+
+    if args.check:
+        problems = check()
+        for line in problems:
+            print(line)
+        print("bake is up to date" if not problems else f"{len(problems)} sheet(s) need baking")
+        return 1 if problems else 0
+
+    entries = bake()
+    print(f"baked {len(entries)} sheets into {sprites.BAKED_DIR}/")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
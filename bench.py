@@ -0,0 +1,528 @@
+"""
+Frame-time benchmarks (headless, SDL dummy driver).
+
+    python bench.py                   # all benchmarks
+    python bench.py snowball_rotation
+    python bench.py scenarios         # full PLAYING / menu / GAME_OVER frames
+    python bench.py --stress 100      # grow entity counts until a frame blows the budget
+"""
+import argparse
+import os
+import sys
+import time
+import random
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+WIDTH, HEIGHT = 800, 600
+
+
+# ===============================
+# HELPERS
+# ===============================
+
+def init_display():
+    pygame.init()
+    return pygame.display.set_mode((WIDTH, HEIGHT))
+
+
+def time_frames(frame_fn, frames=120, warmup=10):
+    """Run frame_fn repeatedly, return per-frame times in ms."""
+    for _ in range(warmup):
+        frame_fn()
+
+    times = []
+    for _ in range(frames):
+        t0 = time.perf_counter()
+        frame_fn()
+        times.append((time.perf_counter() - t0) * 1000.0)
+    return times
+
+
+def mean(values):
+    return sum(values) / len(values) if values else 0.0
+
+
+def percentile(values, pct):
+    """Linear-interpolated percentile (pct in 0..100)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * pct / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def measure_allocations(frame_fn, frames=30):
+    """
+    Python-side allocation cost of one frame, averaged over frames:
+    (KB allocated at peak within the frame, net memory blocks left behind).
+    Run separately from time_frames() because tracing slows frames down.
+    """
+    frame_fn()
+    tracemalloc.start()
+    total_bytes = 0
+    total_blocks = 0
+    try:
+        for _ in range(frames):
+            tracemalloc.reset_peak()
+            start, _ = tracemalloc.get_traced_memory()
+            blocks = sys.getallocatedblocks()
+            frame_fn()
+            _, peak = tracemalloc.get_traced_memory()
+            total_bytes += peak - start
+            total_blocks += sys.getallocatedblocks() - blocks
+    finally:
+        tracemalloc.stop()
+    return total_bytes / frames / 1024.0, total_blocks / frames
+
+
+# ===============================
+# BENCHMARKS
+# ===============================
+
+def bench_snowball_rotation():
+    """Per-frame transform.rotate vs pre-rotated frame tables."""
+    from entities import Snowball, SNOWBALL_SPIN_STEP
+
+    surface = init_display()
+    random.seed(0)
+
+    def legacy_draw(sb):
+        # the old Snowball.draw: rotate the scaled image every frame
+        rotated = pygame.transform.rotate(sb.image, sb.rotation_angle)
+        surface.blit(rotated, rotated.get_rect(center=(int(sb.x), int(sb.y))))
+
+    def table_draw(sb):
+        rotated = sb.rotations[sb.rotation_angle // SNOWBALL_SPIN_STEP]
+        surface.blit(rotated, rotated.get_rect(center=(int(sb.x), int(sb.y))))
+
+    print("snowball_rotation (ms/frame)")
+    print(f"{'count':>8} {'rotate':>10} {'table':>10} {'speedup':>9}")
+    for count in (50, 200, 1000):
+        balls = []
+        for _ in range(count):
+            sb = Snowball(surface, 0)
+            sb.x = random.randint(0, WIDTH)
+            sb.y = random.randint(0, HEIGHT)
+            sb.rotation_angle = random.randrange(0, 360, SNOWBALL_SPIN_STEP)
+            balls.append(sb)
+
+        results = {}
+        for name, draw in (("rotate", legacy_draw), ("table", table_draw)):
+            def frame():
+                for sb in balls:
+                    sb.rotation_angle = (sb.rotation_angle + SNOWBALL_SPIN_STEP) % 360
+                    draw(sb)
+            results[name] = mean(time_frames(frame))
+
+        speedup = results["rotate"] / results["table"] if results["table"] else 0.0
+        print(f"{count:>8} {results['rotate']:>10.3f} {results['table']:>10.3f} {speedup:>8.1f}x")
+
+
+def bench_snowball_field():
+    """Per-object snowball loop vs the NumPy SnowballField (update+draw+collide+cull)."""
+    import math
+    from entities import Snowball
+    from snowballs import SnowballField
+
+    surface = init_display()
+    random.seed(0)
+    penguin_x, penguin_y, penguin_r = -1000.0, -1000.0, 36  # never hit
+
+    print("snowball_field (ms/frame)")
+    print(f"{'count':>8} {'objects':>10} {'field':>10} {'speedup':>9}")
+    for count in (200, 1000, 3000):
+        balls = []
+        field = SnowballField()
+        field.warm_up()
+        for _ in range(count):
+            sb = Snowball(surface, 0)
+            sb.x = random.randint(0, WIDTH)
+            sb.y = random.randint(0, HEIGHT)
+            sb.vx = sb.vy = 0.0  # stay on screen for the whole run
+            balls.append(sb)
+            field.add(sb.x, sb.y, 0.0, 0.0, sb.radius)
+
+        def objects_frame():
+            for sb in balls[:]:
+                sb.update()
+                sb.draw()
+                math.hypot(sb.x - penguin_x, sb.y - penguin_y) < sb.radius + penguin_r
+                if sb.x < -200 or sb.x > WIDTH + 200 or sb.y < -200 or sb.y > HEIGHT + 200:
+                    balls.remove(sb)
+
+        def field_frame():
+            field.update()
+            field.draw(surface, 0.0, 0.0)
+            field.collides_circle(penguin_x, penguin_y, penguin_r)
+            field.cull(-200, -200, WIDTH + 200, HEIGHT + 200)
+
+        t_obj = mean(time_frames(objects_frame, frames=60))
+        t_field = mean(time_frames(field_frame, frames=60))
+        speedup = t_obj / t_field if t_field else 0.0
+        print(f"{count:>8} {t_obj:>10.3f} {t_field:>10.3f} {speedup:>8.1f}x")
+
+
+def bench_patch_stencils():
+    """SnowPatch spawn cost + pixel memory: per-patch surfaces vs the stencil pool."""
+    import math
+    import entities
+    from entities import SnowPatch
+
+    init_display()
+    live = 12  # ~45 s lifetime / ~3.5 s spawn cadence
+
+    def legacy_patch(rect):
+        # the old SnowPatch.__init__: two surfaces + a fresh polygon per patch
+        surface = pygame.Surface(rect.size, pygame.SRCALPHA)
+        mask_surface = pygame.Surface(rect.size, pygame.SRCALPHA)
+        cx, cy = rect.w // 2, rect.h // 2
+        points = []
+        for i in range(14):
+            ang = i * (2 * math.pi / 14)
+            jitter = random.uniform(0.75, 1.1)
+            points.append((cx + math.cos(ang) * cx * jitter, cy + math.sin(ang) * cy * jitter))
+        pygame.draw.polygon(surface, (235, 235, 255, 160), points)
+        pygame.draw.polygon(mask_surface, (0, 0, 0, 45), points)
+        return (surface, mask_surface)
+
+    def rects(count):
+        random.seed(0)
+        return [pygame.Rect(0, 0, random.randint(160, 240), random.randint(120, 190)) for _ in range(count)]
+
+    print("patch_stencils (spawn = ms per patch, memory = KB of pixels for the live set)")
+    print(f"{'spawns':>8} {'legacy ms':>10} {'pool ms':>10} {'legacy KB':>10} {'pool KB':>10} {'hit rate':>9}")
+    for count in (12, 100, 1000):
+        batch = rects(count)
+
+        start = time.perf_counter()
+        legacy = [legacy_patch(r) for r in batch]
+        t_legacy = (time.perf_counter() - start) * 1000.0 / count
+        legacy_kb = sum(entities.surface_bytes(s) for pair in legacy[-live:] for s in pair) / 1024.0
+
+        entities._stencils.clear()
+        for k in entities._stencil_stats:
+            entities._stencil_stats[k] = 0
+        start = time.perf_counter()
+        pooled = [SnowPatch(None, r, spawn_time=0) for r in batch]
+        t_pool = (time.perf_counter() - start) * 1000.0 / count
+
+        # pixels reachable from the live patches or the pool (shared ones once)
+        surfaces = {id(p.surface): p.surface for p in pooled[-live:]}
+        surfaces.update((id(s), s) for s in entities._stencils.values())
+        pool_kb = sum(entities.surface_bytes(s) for s in surfaces.values()) / 1024.0
+        stats = entities.stencil_stats()
+        hit_rate = stats["hits"] / count
+        print(f"{count:>8} {t_legacy:>10.3f} {t_pool:>10.3f} {legacy_kb:>10.0f} {pool_kb:>10.0f} {hit_rate:>8.0%}")
+
+
+def bench_spatial_query():
+    """Circle queries: brute-force scan vs SpatialHash, growing entity counts."""
+    from spatial import SpatialHash
+
+    random.seed(0)
+    queries = [(random.uniform(0, 20000), random.uniform(0, 20000)) for _ in range(200)]
+    radius = 60
+
+    print("spatial_query (us/query, entities spread over a 20000px square)")
+    print(f"{'count':>8} {'brute':>10} {'hash':>10} {'speedup':>9}")
+    for count in (1000, 10000, 100000):
+        points = [(random.uniform(0, 20000), random.uniform(0, 20000), 8.0) for _ in range(count)]
+        index = SpatialHash(96)
+        for i, (x, y, r) in enumerate(points):
+            index.insert(i, x, y, r)
+
+        def brute():
+            for qx, qy in queries:
+                [i for i, (x, y, r) in enumerate(points)
+                 if (x - qx) ** 2 + (y - qy) ** 2 < (r + radius) ** 2]
+
+        def hashed():
+            for qx, qy in queries:
+                index.query_circle(qx, qy, radius)
+
+        per_query = 1000.0 / len(queries)  # ms per batch -> us per query
+        t_brute = mean(time_frames(brute, frames=3, warmup=1)) * per_query
+        t_hash = mean(time_frames(hashed, frames=20, warmup=2)) * per_query
+        speedup = t_brute / t_hash if t_hash else 0.0
+        print(f"{count:>8} {t_brute:>10.1f} {t_hash:>10.1f} {speedup:>8.0f}x")
+
+
+# ===============================
+# SCENARIOS (whole frames: simulation tick + render + flip)
+# ===============================
+
+FRAME_BUDGET_MS = 1000.0 / 60
+SIM_DT_MS = 1000.0 / 60
+
+
+class ScenarioWorld:
+    """Display, fonts and renderer shared by the frame scenarios."""
+
+    def __init__(self):
+        from utils import resource_path
+        from screenwrap import Screen
+        from background import ScrollingBackground, load_floor_tile
+        from renderer import GameRenderer
+        import sprites
+
+        pygame.init()
+        self.screen = Screen(WIDTH, HEIGHT)
+        self.font = pygame.font.Font(resource_path("assets/fonts/pixel.ttf"), 24)
+        self.big_font = pygame.font.Font(resource_path("assets/fonts/pixel.ttf"), 48)
+
+        self.background = ScrollingBackground(load_floor_tile(), WIDTH, HEIGHT, scale=1)
+        self.title_img = sprites.load_image("assets/ui/title.png")
+
+        fish_icon = sprites.load_frames("assets/powerups/fishy.png", 3, 3, scale=48 / 32)[0]
+        pebble_icon = sprites.load_frames("assets/powerups/pebble.png", 3, 3, scale=64 / 32)[0]
+        self.renderer = GameRenderer(
+            self.screen, self.background, self.font, self.big_font, fish_icon, pebble_icon
+        )
+
+    def new_game(self):
+        from game import GameState
+        return GameState(self.screen)
+
+    def resize(self, width, height):
+        self.screen.update_size(width, height)
+        self.background.rebuild(width, height)
+
+
+def walking_keys(frame_no):
+    """Scripted input: walk a square so the camera keeps scrolling."""
+    from game import KeyProxy
+    keys = (pygame.K_RIGHT, pygame.K_DOWN, pygame.K_LEFT, pygame.K_UP)
+    return KeyProxy({keys[(frame_no // 90) % 4]: True})
+
+
+def playing_frame(world, game, frame_no):
+    game.step(walking_keys(frame_no), SIM_DT_MS)
+    game.game_over = False  # keep the run going; we only measure cost
+    world.renderer.draw_playing(game, 1.0, frame_no * SIM_DT_MS)
+    pygame.display.flip()
+
+
+def scenario_snowballs(world, count):
+    """PLAYING with count snowballs alive (topped up every frame)."""
+    game = world.new_game()
+    screen = world.screen
+    frame_no = [0]
+
+    def frame():
+        state = game.world
+        field = game.snowballs
+        while field.count < count:
+            field.spawn(screen.width, screen.height, state.camera_x, state.camera_y, state.score)
+        playing_frame(world, game, frame_no[0])
+        frame_no[0] += 1
+    return frame
+
+
+def scenario_patches(world, count):
+    """PLAYING with count SnowPatch instances (and their flakes)."""
+    from entities import SnowPatch
+
+    game = world.new_game()
+    screen = world.screen
+    frame_no = [0]
+
+    def frame():
+        state = game.world
+        while len(game.snow_patches) < count:
+            world_rect = pygame.Rect(
+                int(state.camera_x) + random.randint(0, max(0, screen.width - 200)),
+                int(state.camera_y) + random.randint(0, max(0, screen.height - 160)),
+                random.randint(160, 240),
+                random.randint(120, 190)
+            )
+            game.add_patch(SnowPatch(screen.screen, world_rect, spawn_time=state.sim_time))
+        playing_frame(world, game, frame_no[0])
+        frame_no[0] += 1
+    return frame
+
+
+def scenario_flakes(world, count):
+    """PLAYING with about count patch flakes (emitters only, no patch surfaces)."""
+    game = world.new_game()
+    screen = world.screen
+    flakes = game.patch_flakes
+    frame_no = [0]
+
+    def frame():
+        state = game.world
+        while len(flakes) < count:
+            world_rect = pygame.Rect(
+                int(state.camera_x) + random.randint(0, max(0, screen.width - 200)),
+                int(state.camera_y) + random.randint(0, max(0, screen.height - 160)),
+                random.randint(160, 240),
+                random.randint(120, 190)
+            )
+            flakes.add(len(flakes), world_rect)
+        playing_frame(world, game, frame_no[0])
+        frame_no[0] += 1
+    return frame
+
+
+def scenario_menu_idle(world, count=None):
+    """START menu with no input (cached MenuLayer blit)."""
+    from menus import MenuLayer, render_start_menu
+
+    layer = MenuLayer(render_start_menu)
+    surface = world.screen.screen
+
+    def frame():
+        menu = layer.get(
+            surface.get_size(), 0,
+            world.background, world.font, world.big_font, world.title_img, 0
+        )
+        surface.blit(menu, (0, 0))
+        pygame.display.flip()
+    return frame
+
+
+def scenario_game_over(world, count=None):
+    """GAME_OVER attract mode (pooled snowballs + text)."""
+    game = world.new_game()
+    game.start_attract()
+
+    def frame():
+        game.step_attract(SIM_DT_MS)
+        world.renderer.draw_game_over(game, 0, 0)
+        pygame.display.flip()
+    return frame
+
+
+def scenario_resize(world, count=None):
+    """PLAYING while the window is resized every frame."""
+    game = world.new_game()
+    sizes = ((WIDTH, HEIGHT), (1024, 768), (640, 480))
+    frame_no = [0]
+
+    def frame():
+        world.resize(*sizes[frame_no[0] % len(sizes)])
+        playing_frame(world, game, frame_no[0])
+        frame_no[0] += 1
+    return frame
+
+
+# name -> (factory, default entity counts; None = not scalable)
+SCENARIOS = {
+    "snowballs": (scenario_snowballs, (50, 200, 1000)),
+    "patches": (scenario_patches, (1, 5, 20)),
+    "flakes": (scenario_flakes, (300, 3000, 30000)),
+    "menu_idle": (scenario_menu_idle, None),
+    "game_over": (scenario_game_over, None),
+    "resize": (scenario_resize, None),
+}
+
+
+def run_scenario(world, name, count, frames=120):
+    random.seed(0)
+    factory, _ = SCENARIOS[name]
+    frame = factory(world, count)
+    times = time_frames(frame, frames=frames)
+    alloc_kb, blocks = measure_allocations(frame)
+    world.resize(WIDTH, HEIGHT)
+    return {
+        "mean": mean(times),
+        "p95": percentile(times, 95),
+        "p99": percentile(times, 99),
+        "alloc_kb": alloc_kb,
+        "blocks": blocks,
+    }
+
+
+def print_scenario_header():
+    print(f"{'scenario':>10} {'count':>7} {'mean':>8} {'p95':>8} {'p99':>8} {'alloc KB':>9} {'blocks':>7}")
+
+
+def print_scenario_row(name, count, r):
+    shown = "-" if count is None else count
+    print(f"{name:>10} {shown:>7} {r['mean']:>8.3f} {r['p95']:>8.3f} {r['p99']:>8.3f}"
+          f" {r['alloc_kb']:>9.1f} {r['blocks']:>7.1f}")
+
+
+def bench_scenarios():
+    """Scripted whole-frame scenarios: mean / p95 / p99 ms and allocations per frame."""
+    world = ScenarioWorld()
+    print("scenarios (ms/frame; alloc KB = Python allocations per frame, blocks = net growth)")
+    print_scenario_header()
+    for name, (_, counts) in SCENARIOS.items():
+        for count in counts or (None,):
+            print_scenario_row(name, count, run_scenario(world, name, count))
+
+
+def bench_stress(start):
+    """
+    Double each scalable scenario's entity count from start until p95 frame
+    time exceeds the 60 FPS budget, then bisect for the largest count that
+    still fits.
+    """
+    world = ScenarioWorld()
+    print(f"stress (budget {FRAME_BUDGET_MS:.1f} ms at p95)")
+    print_scenario_header()
+
+    for name, (_, counts) in SCENARIOS.items():
+        if counts is None:
+            continue
+
+        def over_budget(count):
+            r = run_scenario(world, name, count, frames=60)
+            print_scenario_row(name, count, r)
+            return r["p95"] > FRAME_BUDGET_MS
+
+        fits, blown = 0, start
+        while not over_budget(blown):
+            fits, blown = blown, blown * 2
+            if blown > 1_000_000:
+                break
+        else:
+            while blown - fits > max(1, fits // 20):
+                mid = (fits + blown) // 2
+                if over_budget(mid):
+                    blown = mid
+                else:
+                    fits = mid
+        print(f"{name}: {fits} fit the budget\n")
+
+
+BENCHMARKS = {
+    "snowball_rotation": bench_snowball_rotation,
+    "snowball_field": bench_snowball_field,
+    "patch_stencils": bench_patch_stencils,
+    "spatial_query": bench_spatial_query,
+    "scenarios": bench_scenarios,
+}
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Dodgy Penguin frame-time benchmarks")
+    parser.add_argument("names", nargs="*", help=f"benchmarks to run ({', '.join(BENCHMARKS)})")
+    parser.add_argument("--stress", type=int, metavar="N",
+                        help="grow scenario entity counts from N until the frame budget is blown")
+    args = parser.parse_args(argv)
+
+    if args.stress is not None and args.stress < 1:
+        parser.error("--stress needs a positive entity count")
+
+    names = args.names or ([] if args.stress is not None else list(BENCHMARKS))
+    for name in names:
+        if name not in BENCHMARKS:
+            print(f"unknown benchmark: {name} (choose from {', '.join(BENCHMARKS)})")
+            return 2
+        BENCHMARKS[name]()
+
+    if args.stress is not None:
+        bench_stress(args.stress)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
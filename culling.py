@@ -0,0 +1,70 @@
+import pygame
+
+
+# ===============================
+# VIEW CULLING
+# ===============================
+
+class ViewCuller:
+    """
+    The camera's world rect for the frame being drawn, plus drawn / culled
+    counters per entity kind. Culled entities keep simulating; they just
+    skip their draw call (and blits).
+
+        culler.begin(cam_x, cam_y, view_w, view_h)
+        if culler.visible("fish", fish.world_x, fish.world_y, half_w, half_h):
+            fish.draw(...)
+        culler.count("snowballs", drawn, culled)   # for array-culled kinds
+
+    margin grows the view rect (pixels) so sprites are never cut at the edge.
+    """
+
+    def __init__(self, margin=0):
+        self.margin = margin
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.counts = {}   # kind -> [drawn, culled] since begin()
+
+        self._left = self._top = self._right = self._bottom = 0.0
+
+    def begin(self, camera_x, camera_y, width, height):
+        """Start a frame: set the world-space view rect, reset counters."""
+        self.counts = {}
+        m = self.margin
+        self._left = camera_x - m
+        self._top = camera_y - m
+        self._right = camera_x + width + m
+        self._bottom = camera_y + height + m
+        self.rect = pygame.Rect(int(self._left), int(self._top), int(width + 2 * m), int(height + 2 * m))
+
+    @property
+    def bounds(self):
+        """(left, top, right, bottom) of the view in world space."""
+        return self._left, self._top, self._right, self._bottom
+
+    def visible(self, kind, x, y, half_w, half_h) -> bool:
+        """Whether a box centred on world (x, y) overlaps the view (counted)."""
+        shown = (
+            x + half_w >= self._left and x - half_w <= self._right and
+            y + half_h >= self._top and y - half_h <= self._bottom
+        )
+        counts = self.counts.get(kind)
+        if counts is None:
+            counts = self.counts[kind] = [0, 0]
+        counts[0 if shown else 1] += 1
+        return shown
+
+    def count(self, kind, drawn, culled):
+        counts = self.counts.get(kind)
+        if counts is None:
+            counts = self.counts[kind] = [0, 0]
+        counts[0] += drawn
+        counts[1] += culled
+
+    def totals(self):
+        """(drawn, culled) for the frame, summed over kinds."""
+        counts = self.counts.values()
+        return sum(c[0] for c in counts), sum(c[1] for c in counts)
+
+    def stats(self) -> dict:
+        """kind -> (drawn, culled) for the frame."""
+        return {kind: tuple(c) for kind, c in self.counts.items()}
@@ -0,0 +1,152 @@
+import pygame
+
+
+# ===============================
+# RECT MERGING
+# ===============================
+
+def merge_rects(rects, bounds, slack=8):
+    """
+    Clip rects to bounds and union any that overlap or lie within slack
+    pixels of each other, so display.update() gets a few larger rects
+    instead of many tiny ones.
+    """
+    merged = []
+    for rect in rects:
+        rect = rect.clip(bounds)
+        if not rect.w or not rect.h:
+            continue
+        hit = rect.inflate(slack, slack).collidelist(merged)
+        while hit != -1:
+            rect = rect.union(merged.pop(hit))
+            hit = rect.inflate(slack, slack).collidelist(merged)
+        merged.append(rect)
+    return merged
+
+
+# ===============================
+# DIRTY RECT PRESENTER
+# ===============================
+
+class DirtyRects:
+    """
+    Optional partial present. Each frame is still drawn in full to the
+    display surface, but only regions that changed are pushed to the
+    window: everything drawn this frame plus everything drawn last frame
+    (those pixels now show floor again).
+
+    Falls back to a full display.update() when:
+      - begin() gets a different key (state change, resize, menu re-render)
+      - the background scrolled more than scroll_threshold pixels since the
+        last full present (0 = any scroll)
+      - merged rects exceed max_rects or cover more than max_coverage of
+        the screen (a full present is cheaper by then)
+    """
+
+    def __init__(self, scroll_threshold=0, max_rects=48, max_coverage=0.5, slack=8):
+        self.enabled = False
+        self.scroll_threshold = scroll_threshold
+        self.max_rects = max_rects
+        self.max_coverage = max_coverage
+        self.slack = slack
+
+        self._rects = []
+        self._last = []
+        self._full = True
+        self._key = None
+        self._offset = None        # background offset at the last full present
+        self._frame_offset = None  # background offset of the frame being drawn
+
+        self.full_presents = 0
+        self.partial_presents = 0
+        self.rects_presented = 0
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+        self.invalidate()
+
+    def invalidate(self):
+        """Next present() updates the whole window."""
+        self._full = True
+
+    # --------------------------------------------------
+    # Per-frame tracking
+    # --------------------------------------------------
+
+    def begin(self, key):
+        """Start a frame; a key different from the last frame's forces a full present."""
+        if key != self._key:
+            self._key = key
+            self._full = True
+        self._frame_offset = None
+
+    def scrolled(self, offset, period):
+        """
+        Report the background's pixel offset (ScrollingBackground.offset)
+        and its wrap period (tile size).
+        """
+        if not self.enabled:
+            return
+        self._frame_offset = offset
+        if self._offset is None:
+            self._full = True
+            return
+        for now, then, size in zip(offset, self._offset, period):
+            d = abs(now - then) % size
+            if min(d, size - d) > self.scroll_threshold:
+                self._full = True
+                return
+
+    def add(self, rect):
+        if self.enabled and rect:
+            self._rects.append(rect)
+
+    def extend(self, rects):
+        if self.enabled and rects:
+            self._rects.extend(r for r in rects if r)
+
+    # --------------------------------------------------
+    # Present
+    # --------------------------------------------------
+
+    def present(self, surface):
+        """Push this frame to the window (everything, or just the dirty rects)."""
+        if not self.enabled:
+            pygame.display.update()
+            return
+
+        rects = self._rects
+        full = self._full
+        bounds = surface.get_rect()
+
+        if not full and len(self._last) + len(rects) > self.max_rects * 8:
+            full = True  # not worth merging
+
+        if not full:
+            merged = merge_rects(self._last + rects, bounds, self.slack)
+            area = sum(r.w * r.h for r in merged)
+            if len(merged) > self.max_rects or area > bounds.w * bounds.h * self.max_coverage:
+                full = True
+
+        if full:
+            pygame.display.update()
+            self.full_presents += 1
+            self._offset = self._frame_offset
+        else:
+            if merged:
+                pygame.display.update(merged)
+            self.partial_presents += 1
+            self.rects_presented += len(merged)
+
+        self._last = rects
+        self._rects = []
+        self._full = False
+
+    def stats(self) -> dict:
+        presents = self.full_presents + self.partial_presents
+        return {
+            "full": self.full_presents,
+            "partial": self.partial_presents,
+            "partial_rate": self.partial_presents / presents if presents else 0.0,
+            "rects_per_partial": self.rects_presented / self.partial_presents if self.partial_presents else 0.0,
+        }
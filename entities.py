@@ -1,37 +1,32 @@
 import pygame
 import random
 import math
-from utils import resource_path
+from collections import OrderedDict
+from itertools import count
+import sprites
+from atlas import atlas, SpriteBatch
 
 
 # -------------------------
 # Fish Power-Up
 # -------------------------
 class FishPowerUp:
+    __slots__ = ("screen", "frames", "regions", "current_frame", "animation_timer", "animation_speed",
+                 "radius", "x", "y", "world_x", "world_y")
+
     def __init__(self, screen):
         self.screen = screen  # raw pygame.Surface
-        self.sprite_sheet = pygame.image.load(resource_path("assets/powerups/fishy.png")).convert_alpha()
-        self.frames = []
+        self.frames = sprites.load_frames("assets/powerups/fishy.png", 3, 3, scale=1.5)
+        self.regions = atlas.frames(self.frames)
         self.current_frame = 0
         self.animation_timer = 0
         self.animation_speed = 100  # ms per frame
 
-        sheet_width, sheet_height = self.sprite_sheet.get_size()
-        fw = sheet_width // 3
-        fh = sheet_height // 3
-        scale_factor = 1.5
-
-        for row in range(3):
-            for col in range(3):
-                x = col * fw
-                y = row * fh
-                frame = self.sprite_sheet.subsurface(pygame.Rect(x, y, fw, fh))
-                frame = pygame.transform.scale(frame, (int(fw * scale_factor), int(fh * scale_factor)))
-                self.frames.append(frame)
-
         self.radius = int(min(self.frames[0].get_width(), self.frames[0].get_height()) * 0.33)
         self.x = random.randint(self.radius, self.screen.get_width() - self.radius)
         self.y = random.randint(self.radius, self.screen.get_height() - self.radius)
+        self.world_x = float(self.x)
+        self.world_y = float(self.y)
 
     def update(self, dt):
         self.animation_timer += dt
@@ -39,18 +34,22 @@ class FishPowerUp:
             self.animation_timer = 0
             self.current_frame = (self.current_frame + 1) % len(self.frames)
 
-    def draw(self):
+    def draw(self, batch=None):
+        """Queue into batch (a SpriteBatch), or blit now. Returns the rect covered."""
         frame = self.frames[self.current_frame]
+        out = batch if batch is not None else SpriteBatch()
 
         # draw shadow
         shadow_w = int(frame.get_width() * 0.55)
         shadow_h = 6
-        shadow_surface = pygame.Surface((shadow_w, shadow_h), pygame.SRCALPHA)
-        pygame.draw.ellipse(shadow_surface, (0, 0, 0, 80), shadow_surface.get_rect())
-        self.screen.blit(shadow_surface, (int(self.x - shadow_w / 2), int(self.y + frame.get_height() * 0.18)))
+        shadow_surface = sprites.get_shadow(shadow_w, shadow_h, 80)
+        rect = out.add(shadow_surface, (int(self.x - shadow_w / 2), int(self.y + frame.get_height() * 0.18)))
 
         # draw image
-        self.screen.blit(frame, frame.get_rect(center=(int(self.x), int(self.y))))
+        rect.union_ip(out.add_region(self.regions[self.current_frame], frame.get_rect(center=(int(self.x), int(self.y)))))
+        if batch is None:
+            out.flush(self.screen)
+        return rect
 
     def collides_with(self, penguin):
         dx = self.x - penguin.x
@@ -62,30 +61,22 @@ class FishPowerUp:
 # Pebble
 # -------------------------
 class Pebble:
+    __slots__ = ("screen", "frames", "regions", "current_frame", "animation_timer", "animation_speed",
+                 "radius", "x", "y", "world_x", "world_y")
+
     def __init__(self, screen):
         self.screen = screen
-        self.sprite_sheet = pygame.image.load(resource_path("assets/powerups/pebble.png")).convert_alpha()
-        self.frames = []
+        self.frames = sprites.load_frames("assets/powerups/pebble.png", 3, 3, scale=2.5)
+        self.regions = atlas.frames(self.frames)
         self.current_frame = 0
         self.animation_timer = 0
         self.animation_speed = 100
 
-        sheet_width, sheet_height = self.sprite_sheet.get_size()
-        fw = sheet_width // 3
-        fh = sheet_height // 3
-        scale_factor = 2.5
-
-        for row in range(3):
-            for col in range(3):
-                x = col * fw
-                y = row * fh
-                frame = self.sprite_sheet.subsurface(pygame.Rect(x, y, fw, fh))
-                frame = pygame.transform.scale(frame, (int(fw * scale_factor), int(fh * scale_factor)))
-                self.frames.append(frame)
-
         self.radius = int(min(self.frames[0].get_width(), self.frames[0].get_height()) * 0.25)
         self.x = random.randint(self.radius, self.screen.get_width() - self.radius)
         self.y = random.randint(self.radius, self.screen.get_height() - self.radius)
+        self.world_x = float(self.x)
+        self.world_y = float(self.y)
 
     def update(self, dt):
         self.animation_timer += dt
@@ -93,18 +84,22 @@ class Pebble:
             self.animation_timer = 0
             self.current_frame = (self.current_frame + 1) % len(self.frames)
 
-    def draw(self):
+    def draw(self, batch=None):
+        """Queue into batch (a SpriteBatch), or blit now. Returns the rect covered."""
         frame = self.frames[self.current_frame]
+        out = batch if batch is not None else SpriteBatch()
 
         # draw shadow
         shadow_w = int(frame.get_width() * 0.45)
         shadow_h = 6
-        shadow_surface = pygame.Surface((shadow_w, shadow_h), pygame.SRCALPHA)
-        pygame.draw.ellipse(shadow_surface, (0, 0, 0, 80), shadow_surface.get_rect())
-        self.screen.blit(shadow_surface, (int(self.x - shadow_w / 2), int(self.y + frame.get_height() * 0.20)))
+        shadow_surface = sprites.get_shadow(shadow_w, shadow_h, 80)
+        rect = out.add(shadow_surface, (int(self.x - shadow_w / 2), int(self.y + frame.get_height() * 0.20)))
 
         # draw image
-        self.screen.blit(frame, frame.get_rect(center=(int(self.x), int(self.y))))
+        rect.union_ip(out.add_region(self.regions[self.current_frame], frame.get_rect(center=(int(self.x), int(self.y)))))
+        if batch is None:
+            out.flush(self.screen)
+        return rect
 
     def collides_with(self, penguin):
         dx = self.x - penguin.x
@@ -144,8 +139,7 @@ class MultiplierPowerUp:
         # draw shadow
         shadow_w = int(frame_img.get_width() * 0.8)
         shadow_h = 6
-        shadow_surface = pygame.Surface((shadow_w, shadow_h), pygame.SRCALPHA)
-        pygame.draw.ellipse(shadow_surface, (0, 0, 0, 80), shadow_surface.get_rect())
+        shadow_surface = sprites.get_shadow(shadow_w, shadow_h, 80)
         screen_surface.blit(shadow_surface, (int(self.x - shadow_w / 2), int(self.y + frame_img.get_height() * 0.20)))
 
         # draw image
@@ -158,70 +152,138 @@ class MultiplierPowerUp:
 
 
 # -------------------------
-# Patch Snowflake
+# Snow Patch stencils
 # -------------------------
-class PatchSnowflake:
-    def __init__(self, patch):
-        self.patch = patch
-        self.reset()
-
-    def reset(self):
-        self.x = random.randint(self.patch.rect.left, self.patch.rect.right)
-        self.y = random.randint(self.patch.rect.top - 20, self.patch.rect.top)
-        self.speed = random.uniform(0.3, 1.0)
-        self.size = random.randint(1, 3)
-
-    def update(self):
-        self.y += self.speed
-        if self.y > self.patch.rect.bottom:
-            self.reset()
-
-    def draw(self, surface):
-        pygame.draw.circle(surface, (255, 255, 255), (int(self.x), int(self.y)), self.size)
+# Patch blobs are jittered polygons. Sizes snap to the nearest
+# PATCH_SIZE_STEP and shapes come from PATCH_SHAPE_SEEDS seeds, so a small
+# pool of pre-rasterized stencils (shared, read-only) covers every patch.
+# LRU bounded by pixel bytes; live patches keep their own stencil alive,
+# so memory no longer grows with the patch count.
+PATCH_SIZE_STEP = 32
+PATCH_SHAPE_SEEDS = 3
+PATCH_POINTS = 14
+PATCH_COLOR = (235, 235, 255, 160)
+PATCH_PREVIEW_COLOR = (0, 0, 0, 45)
+STENCIL_CACHE_BYTES = 2 * 1024 * 1024
+
+_patch_serials = count()
+_stencils = OrderedDict()
+_stencil_stats = {"hits": 0, "misses": 0, "evictions": 0, "bytes": 0}
+
+
+def snap_patch_size(width, height):
+    step = PATCH_SIZE_STEP
+    return max(step, round(width / step) * step), max(step, round(height / step) * step)
+
+
+def patch_polygon(size, seed) -> list:
+    """Jittered PATCH_POINTS-gon filling size; the same seed gives the same shape."""
+    rng = random.Random(seed)
+    w, h = size
+    cx, cy = w // 2, h // 2
+    rx, ry = w // 2, h // 2
+
+    points = []
+    for i in range(PATCH_POINTS):
+        ang = i * (2 * math.pi / PATCH_POINTS)
+        jitter = rng.uniform(0.75, 1.1)
+        points.append((cx + math.cos(ang) * rx * jitter, cy + math.sin(ang) * ry * jitter))
+    return points
+
+
+def get_patch_stencil(size, seed, color=PATCH_COLOR) -> pygame.Surface:
+    """Shared SRCALPHA surface with the patch polygon filled in color. Do not draw onto it."""
+    key = (tuple(size), seed, color)
+    surf = _stencils.get(key)
+    if surf is not None:
+        _stencils.move_to_end(key)
+        _stencil_stats["hits"] += 1
+        return surf
+
+    _stencil_stats["misses"] += 1
+    surf = pygame.Surface(key[0], pygame.SRCALPHA)
+    pygame.draw.polygon(surf, color, patch_polygon(key[0], seed))
+    _stencils[key] = surf
+    _stencil_stats["bytes"] += surface_bytes(surf)
+
+    while _stencil_stats["bytes"] > STENCIL_CACHE_BYTES and len(_stencils) > 1:
+        _, old = _stencils.popitem(last=False)
+        _stencil_stats["bytes"] -= surface_bytes(old)
+        _stencil_stats["evictions"] += 1
+    return surf
+
+
+def surface_bytes(surface) -> int:
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+
+def stencil_stats() -> dict:
+    return {
+        "stencils": len(_stencils),
+        "bytes": _stencil_stats["bytes"],
+        "hits": _stencil_stats["hits"],
+        "misses": _stencil_stats["misses"],
+        "evictions": _stencil_stats["evictions"],
+    }
 
 
 # -------------------------
 # Snow Patch
 # -------------------------
 class SnowPatch:
-    def __init__(self, screen, world_rect):
+    """
+    A world-space snow blob that slows the penguin. world_rect's size is
+    snapped to a stencil bucket; the look comes from the shared
+    stencil pool (random seed unless one is given).
+    """
+
+    def __init__(self, screen, world_rect, spawn_time=None, seed=None):
         self.screen = screen
-        self.world_rect = world_rect.copy()
-        self._screen_rect = pygame.Rect(world_rect)
-        self.spawn_time = pygame.time.get_ticks()
+        self.world_rect = pygame.Rect(world_rect.topleft, snap_patch_size(*world_rect.size))
+        self._screen_rect = self.world_rect.copy()
+        # ms on the caller's clock (the fixed-step sim clock while PLAYING)
+        self.spawn_time = pygame.time.get_ticks() if spawn_time is None else spawn_time
         self.lifetime = 45000
 
-        self.surface = pygame.Surface(self.world_rect.size, pygame.SRCALPHA)
-        self.mask_surface = pygame.Surface(self.world_rect.size, pygame.SRCALPHA)
-
-        # create polygon shape
-        points = []
-        cx, cy = self.world_rect.width // 2, self.world_rect.height // 2
-        rx, ry = self.world_rect.width // 2, self.world_rect.height // 2
-
-        for i in range(14):
-            ang = i * (2 * math.pi / 14)
-            jitter = random.uniform(0.75, 1.1)
-            x = cx + math.cos(ang) * rx * jitter
-            y = cy + math.sin(ang) * ry * jitter
-            points.append((x, y))
-
-        pygame.draw.polygon(self.surface, (235, 235, 255, 160), points)
-        pygame.draw.polygon(self.mask_surface, (0, 0, 0, 45), points)
+        self.serial = next(_patch_serials)  # spawn order (draw order)
+        self.seed = random.randrange(PATCH_SHAPE_SEEDS) if seed is None else seed
+        self.surface = get_patch_stencil(self.world_rect.size, self.seed)
+        self._mask_surface = None  # preview stencil, fetched on first use
 
     @property
     def rect(self):
         return self._screen_rect
 
-    def expired(self):
-        return pygame.time.get_ticks() - self.spawn_time > self.lifetime
-
-    def draw(self, target, camera_x=0, camera_y=0):
+    @property
+    def mask_surface(self):
+        if self._mask_surface is None:
+            self._mask_surface = get_patch_stencil(self.world_rect.size, self.seed, PATCH_PREVIEW_COLOR)
+        return self._mask_surface
+
+    def memory(self) -> dict:
+        """Bytes of pixel data this patch draws from (stencils are shared)."""
+        return {
+            "stencil": surface_bytes(self.surface),
+            "preview": surface_bytes(self._mask_surface) if self._mask_surface is not None else 0,
+        }
+
+    def expired(self, now=None):
+        if now is None:
+            now = pygame.time.get_ticks()
+        return now - self.spawn_time > self.lifetime
+
+    def set_camera(self, camera_x, camera_y):
+        """Place the screen-space rect for the given camera offset."""
         self._screen_rect.topleft = (
             int(self.world_rect.x - camera_x),
             int(self.world_rect.y - camera_y),
         )
-        target.blit(self.surface, self._screen_rect.topleft)
+
+    def draw(self, target, camera_x=0, camera_y=0, batch=None):
+        self.set_camera(camera_x, camera_y)
+        if batch is not None:
+            return batch.add(self.surface, self._screen_rect.topleft)
+        return target.blit(self.surface, self._screen_rect.topleft)
 
     def draw_preview(self, target, screen_rect):
         target.blit(self.mask_surface, screen_rect.topleft)
@@ -230,65 +292,97 @@ class SnowPatch:
 # -------------------------
 # Snowball
 # -------------------------
+SNOWBALL_IMAGE = "assets/snowball/snowball.png"
+SNOWBALL_SPIN_STEP = 5  # degrees per update
+SNOWBALL_MIN_RADIUS = 6
+SNOWBALL_MAX_RADIUS = 10
+
+
+def roll_snowball_radius():
+    return random.randint(SNOWBALL_MIN_RADIUS, SNOWBALL_MAX_RADIUS)
+
+
+def roll_snowball_launch(w, h, radius, score):
+    """
+    Pick a start point just outside a random screen edge and a velocity
+    aimed at the middle third of the screen. Screen coordinates.
+    Returns (x, y, vx, vy).
+    """
+    side = random.randint(0, 3)
+
+    if side == 0:
+        x = random.randint(0, w)
+        y = -radius
+    elif side == 1:
+        x = w + radius
+        y = random.randint(0, h)
+    elif side == 2:
+        x = random.randint(0, w)
+        y = h + radius
+    else:
+        x = -radius
+        y = random.randint(0, h)
+
+    target_x = random.randint(w // 3, w * 2 // 3)
+    target_y = random.randint(h // 3, h * 2 // 3)
+
+    dx = target_x - x
+    dy = target_y - y
+    angle = math.atan2(dy, dx)
+    speed = min(2 + score * 0.1, 6)
+    return x, y, math.cos(angle) * speed, math.sin(angle) * speed
+
+
 class Snowball:
+    __slots__ = ("screen", "radius", "original_image", "image", "rotations", "rotation_regions",
+                 "rotation_angle", "x", "y", "vx", "vy", "world_x", "world_y")
+
     def __init__(self, screen, score):
+        self.reset(screen, score)
+
+    def reset(self, screen, score):
+        """(Re)launch in place; used by SnowballPool to recycle instances."""
         self.screen = screen
-        self.radius = random.randint(6, 10)
-        self.original_image = pygame.image.load(resource_path("assets/snowball/snowball.png")).convert_alpha()
+        self.radius = roll_snowball_radius()
+        self.original_image = sprites.load_image(SNOWBALL_IMAGE)
         scale_factor = (self.radius * 2) / self.original_image.get_width()
-        self.image = pygame.transform.smoothscale(
-            self.original_image,
-            (int(self.original_image.get_width() * scale_factor),
-             int(self.original_image.get_height() * scale_factor))
-        )
+        size = (int(self.original_image.get_width() * scale_factor),
+                int(self.original_image.get_height() * scale_factor))
+        self.image = sprites.load_scaled(SNOWBALL_IMAGE, size, smooth=True)
+        # one frame per spin step, shared by every snowball of this size
+        self.rotations = sprites.load_rotations(SNOWBALL_IMAGE, size, step=SNOWBALL_SPIN_STEP)
+        self.rotation_regions = atlas.frames(self.rotations)
         self.rotation_angle = 0
 
-        side = random.randint(0, 3)
         w, h = self.screen.get_width(), self.screen.get_height()
-
-        if side == 0:
-            self.x = random.randint(0, w)
-            self.y = -self.radius
-        elif side == 1:
-            self.x = w + self.radius
-            self.y = random.randint(0, h)
-        elif side == 2:
-            self.x = random.randint(0, w)
-            self.y = h + self.radius
-        else:
-            self.x = -self.radius
-            self.y = random.randint(0, h)
-
-        target_x = random.randint(w // 3, w * 2 // 3)
-        target_y = random.randint(h // 3, h * 2 // 3)
-
-        dx = target_x - self.x
-        dy = target_y - self.y
-        angle = math.atan2(dy, dx)
-        speed = min(2 + score * 0.1, 6)
-        self.vx = math.cos(angle) * speed
-        self.vy = math.sin(angle) * speed
+        self.x, self.y, self.vx, self.vy = roll_snowball_launch(w, h, self.radius, score)
+        self.world_x = float(self.x)
+        self.world_y = float(self.y)
 
     def update(self):
         self.x += self.vx
         self.y += self.vy
-        self.rotation_angle = (self.rotation_angle + 5) % 360
+        self.rotation_angle = (self.rotation_angle + SNOWBALL_SPIN_STEP) % 360
 
-    def draw(self):
-        shadow_color = (0, 0, 0, 100)
+    def draw(self, batch=None):
+        """Queue into batch (a SpriteBatch), or blit now. Returns the rect covered."""
+        out = batch if batch is not None else SpriteBatch()
+        shadow_alpha = 100
         shadow_offset_y = 22
         shadow_scale = 0.5
 
         shadow_w = self.image.get_width()
         shadow_h = int(self.image.get_height() * shadow_scale)
-        shadow_surface = pygame.Surface((shadow_w, shadow_h), pygame.SRCALPHA)
-        pygame.draw.ellipse(shadow_surface, shadow_color, shadow_surface.get_rect())
+        shadow_surface = sprites.get_shadow(shadow_w, shadow_h, shadow_alpha)
 
-        self.screen.blit(shadow_surface, shadow_surface.get_rect(center=(int(self.x), int(self.y + shadow_offset_y))))
+        rect = out.add(shadow_surface, shadow_surface.get_rect(center=(int(self.x), int(self.y + shadow_offset_y))))
 
-        rotated = pygame.transform.rotate(self.image, self.rotation_angle)
-        rect = rotated.get_rect(center=(int(self.x), int(self.y)))
-        self.screen.blit(rotated, rect)
+        frame = self.rotation_angle // SNOWBALL_SPIN_STEP
+        dest = self.rotations[frame].get_rect(center=(int(self.x), int(self.y)))
+        rect.union_ip(out.add_region(self.rotation_regions[frame], dest))
+        if batch is None:
+            out.flush(self.screen)
+        return rect
 
     def is_off_screen(self):
         return (
@@ -302,24 +396,68 @@ class Snowball:
         return math.hypot(dx, dy) < (self.radius + penguin.radius)
 
 
+# -------------------------
+# Snowball Pool
+# -------------------------
+class SnowballPool:
+    """
+    Recycles Snowball objects: acquire() resets a released instance in
+    place (images come from the shared sprite cache), so steady-state
+    spawning allocates nothing.
+    """
+
+    def __init__(self):
+        self.free = []
+        self.in_use = 0
+        self.high_water = 0
+        self.allocations = 0
+        self.reuses = 0
+
+    def acquire(self, screen, score):
+        if self.free:
+            sb = self.free.pop()
+            sb.reset(screen, score)
+            self.reuses += 1
+        else:
+            sb = Snowball(screen, score)
+            self.allocations += 1
+
+        self.in_use += 1
+        self.high_water = max(self.high_water, self.in_use)
+        return sb
+
+    def release(self, sb):
+        self.in_use -= 1
+        self.free.append(sb)
+
+    def release_all(self, snowballs):
+        for sb in snowballs:
+            self.release(sb)
+        snowballs.clear()
+
+    def stats(self) -> dict:
+        return {
+            "size": self.in_use + len(self.free),
+            "in_use": self.in_use,
+            "free": len(self.free),
+            "high_water": self.high_water,
+            "allocations": self.allocations,
+            "reuses": self.reuses,
+        }
+
+
 # -------------------------
 # Shovel Power-Up
 # -------------------------
 class ShovelPowerUp:
+    __slots__ = ("screen", "frames", "regions", "frame", "anim_timer", "anim_delay",
+                 "radius", "x", "y", "world_x", "world_y")
+
     def __init__(self, screen):
         self.screen = screen
 
-        sheet = pygame.image.load(resource_path("assets/powerups/shovel.png")).convert_alpha()
-
-        self.frames = []
-        fw, fh = 32, 32
-        scale = 2
-
-        for row in range(3):
-            for col in range(3):
-                frame = sheet.subsurface((col * fw, row * fh, fw, fh))
-                frame = pygame.transform.scale(frame, (fw * scale, fh * scale))
-                self.frames.append(frame)
+        self.frames = sprites.load_frames("assets/powerups/shovel.png", 3, 3, scale=2, frame_size=(32, 32))
+        self.regions = atlas.frames(self.frames)
 
         self.frame = 0
         self.anim_timer = 0
@@ -328,6 +466,9 @@ class ShovelPowerUp:
         self.radius = int(self.frames[0].get_width() * 0.35)
         self.x = random.randint(self.radius, self.screen.get_width() - self.radius)
         self.y = random.randint(self.radius, self.screen.get_height() - self.radius)
+        # spawned at a screen position; kept in world space from here on
+        self.world_x = float(self.x)
+        self.world_y = float(self.y)
 
     def update(self, dt):
         self.anim_timer += dt
@@ -335,9 +476,14 @@ class ShovelPowerUp:
             self.anim_timer = 0
             self.frame = (self.frame + 1) % len(self.frames)
 
-    def draw(self):
+    def draw(self, batch=None):
+        """Queue into batch (a SpriteBatch), or blit now. Returns the rect covered."""
+        out = batch if batch is not None else SpriteBatch()
         img = self.frames[self.frame]
-        self.screen.blit(img, img.get_rect(center=(int(self.x), int(self.y))))
+        rect = out.add_region(self.regions[self.frame], img.get_rect(center=(int(self.x), int(self.y))))
+        if batch is None:
+            out.flush(self.screen)
+        return rect
 
     def collides_with(self, penguin):
         dx = self.x - penguin.x
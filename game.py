@@ -0,0 +1,556 @@
+import random
+from operator import attrgetter
+
+import pygame
+
+from player import Penguin
+from entities import FishPowerUp, Pebble, ShovelPowerUp, SnowPatch, SnowballPool
+from snowballs import SnowballField
+from particles import FlakeField
+from spatial import SpatialHash
+from world import Attract, PendingSpawn, PickupKind, World
+from profiler import profiler
+
+
+# -------------------------
+# TUNING (spawn rates / preview)
+# -------------------------
+PATCH_SPAWN_MIN = 2500   # faster patches
+PATCH_SPAWN_MAX = 4500
+PATCH_RESTART_MIN = 8000   # first patch after a restart
+PATCH_RESTART_MAX = 14000
+PATCH_PREVIEW_MS = 900   # preview time before patch appears
+PATCH_FLAKES_PREVIEW = 45
+PATCH_FLAKES_ACTIVE = 30
+
+FISH_SPAWN_MS = 3500     # quicker fish
+PEBBLE_SPAWN_MIN = 15000 # rolled again every tick, so it tends to come early
+PEBBLE_SPAWN_MAX = 25000
+SHOVEL_SPAWN_MS = 45000
+
+POWERUP_PREVIEW_MS = 750 # dim circle preview before powerups appear
+
+PATCH_INDEX_CELL_SIZE = 256  # patches are 160-256 px across
+
+
+# -------------------------
+# Fixed-step clock (render frames -> simulation ticks)
+# -------------------------
+class SimClock:
+    """
+    Accumulates real frame time and hands it out as fixed ticks of
+    step_ms. At most max_steps run per frame; a longer backlog (a stall,
+    a dragged window) is dropped instead of spiralling. alpha is how far
+    rendering is between the last two ticks.
+    """
+
+    def __init__(self, hz=60, max_steps=5):
+        self.step_ms = 1000.0 / hz
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+
+    def advance(self, dt_ms) -> int:
+        """Add dt_ms of frame time; returns the number of ticks to run now."""
+        self.accumulator += dt_ms
+        steps = min(int(self.accumulator // self.step_ms), self.max_steps)
+        self.accumulator -= steps * self.step_ms
+
+        # too far behind: skip the backlog
+        if self.accumulator >= self.step_ms:
+            self.accumulator %= self.step_ms
+        return steps
+
+    def reset(self):
+        self.accumulator = 0.0
+
+    @property
+    def alpha(self) -> float:
+        return self.accumulator / self.step_ms
+
+
+# -------------------------
+# A safe key proxy for scripted input (GAME_OVER animation, bots, benchmarks)
+# (so Penguin.update() can read keys[...] without KeyError)
+# -------------------------
+class KeyProxy:
+    def __init__(self, pressed=None):
+        self.pressed = pressed or {}
+
+    def __getitem__(self, key):
+        return bool(self.pressed.get(key, False))
+
+
+# -------------------------
+# Pickup kinds (spawn rule + effect)
+# -------------------------
+class ShovelKind(PickupKind):
+    """Clears every snow patch and the snowballs around the penguin."""
+
+    __slots__ = ()
+    name = "shovel"
+    early = True
+    layer = "ground"
+    CLEAR_RADIUS = 200
+
+    def create(self, screen):
+        return ShovelPowerUp(screen)
+
+    def due(self, game, dt):
+        self.timer += dt
+        return self.timer >= SHOVEL_SPAWN_MS and self.entity is None
+
+    def collect(self, game):
+        game.clear_patches()
+        # IMPORTANT: use WORLD coords (so it works with camera)
+        penguin = game.world.penguin
+        game.snowballs.remove_within(penguin.world_x, penguin.world_y, self.CLEAR_RADIUS)
+
+
+class FishKind(PickupKind):
+    """Slows snowball spawning down a little (stacks up to +30)."""
+
+    __slots__ = ()
+    name = "fish"
+    preview_ms = POWERUP_PREVIEW_MS
+
+    def create(self, screen):
+        return FishPowerUp(screen)
+
+    def due(self, game, dt):
+        self.timer += dt
+        return self.timer >= FISH_SPAWN_MS and self.entity is None and self.pending is None
+
+    def collect(self, game):
+        world = game.world
+        world.spawn_delay_bonus = min(30, world.spawn_delay_bonus + 5)
+        world.fish_collected += 1
+
+
+class PebbleKind(PickupKind):
+    """One more shield (stacks up to 3)."""
+
+    __slots__ = ()
+    name = "pebble"
+
+    def create(self, screen):
+        return Pebble(screen)
+
+    def due(self, game, dt):
+        self.timer += dt
+        return self.timer >= random.randint(PEBBLE_SPAWN_MIN, PEBBLE_SPAWN_MAX) and self.entity is None
+
+    def collect(self, game):
+        world = game.world
+        world.shield_count = min(3, world.shield_count + 1)
+
+
+# update order; each run gets fresh instances
+PICKUP_KINDS = (ShovelKind, FishKind, PebbleKind)
+
+
+# --------------------------------------------------
+# Game state (PLAYING simulation)
+# --------------------------------------------------
+class GameState:
+    """
+    Everything the PLAYING state simulates, with no drawing, event pumping
+    or disk access. step() advances one tick and returns the events that
+    happened ("pickup", "game_over", "new_highscore") so the caller can
+    play sounds / save data. Works under SDL's dummy video driver.
+
+    Per-run state lives in self.world (a World), the GAME_OVER attract
+    mode in self.attract (an Attract, None until start_attract()).
+    """
+
+    def __init__(self, screen, highscore=0):
+        self.screen = screen
+        self.highscore = highscore
+
+        # CAMERA (Undertale-style deadzone)
+        self.deadzone_w = int(screen.width * 0.55)   # wider
+        self.deadzone_h = int(screen.height * 0.45)  # taller
+
+        self.snowballs = SnowballField()
+        self.snowballs.warm_up()
+
+        # world-space index of live snow patches (friction + draw queries)
+        self.patch_index = SpatialHash(PATCH_INDEX_CELL_SIZE)
+
+        # flakes: falling onto each live patch / onto the pending patch
+        self.patch_flakes = FlakeField(PATCH_FLAKES_ACTIVE, spawn_height=20, speed=(0.3, 1.0), sizes=(1, 3))
+        self.preview_flakes = FlakeField(
+            PATCH_FLAKES_PREVIEW, spawn_height=200, speed=(0.6 * 1.6, 1.3 * 1.6), sizes=(2, 2),
+            respawn=False, capacity=1
+        )
+
+        # GAME_OVER attract-mode snowballs are recycled, not reallocated
+        self.snowball_pool = SnowballPool()
+
+        self.attract = None
+        self.reset(first_patch=(PATCH_SPAWN_MIN, PATCH_SPAWN_MAX))
+
+    # --------------------------------------------------
+    # Reset
+    # --------------------------------------------------
+    def reset(self, first_patch=(PATCH_RESTART_MIN, PATCH_RESTART_MAX)):
+        if self.attract is not None:
+            self.snowball_pool.release_all(self.attract.snowballs)
+            self.attract = None
+        self.snowballs.clear()
+
+        self.world = World(Penguin(self.screen), [kind() for kind in PICKUP_KINDS])
+
+        # snow patch system
+        self.snow_patches = []  # spawn order, so also expiry order
+        self.patch_index.clear()
+        self.patch_flakes.clear()
+        self.preview_flakes.clear()
+        self.next_patch_time = random.randint(*first_patch)  # sim time (ms)
+
+        # "pre-snowfall" animation before a patch appears
+        self.snowfall_active = False
+        self.snowfall_start_time = 0
+
+        self.game_over = False
+
+    # --------------------------------------------------
+    # Snow patches
+    # --------------------------------------------------
+    def add_patch(self, patch):
+        self.snow_patches.append(patch)
+        self.patch_index.insert_rect(patch, patch.world_rect)
+        self.patch_flakes.add(patch, patch.world_rect)
+
+    def remove_patch(self, patch):
+        self.snow_patches.remove(patch)
+        self.patch_index.remove(patch)
+        self.patch_flakes.remove(patch)
+
+    def clear_patches(self):
+        self.snow_patches.clear()
+        self.patch_index.clear()
+        self.patch_flakes.clear()
+
+    def patches_in(self, left, top, right, bottom) -> list:
+        """Live patches whose world rect overlaps the box, in spawn order."""
+        found = [
+            p for p in self.patch_index.candidates(left, top, right, bottom)
+            if p.world_rect.right >= left and p.world_rect.left <= right
+            and p.world_rect.bottom >= top and p.world_rect.top <= bottom
+        ]
+        found.sort(key=attrgetter("serial"))
+        return found
+
+    # --------------------------------------------------
+    # Pickups
+    # --------------------------------------------------
+    def update_pickup(self, kind, dt, events):
+        """Spawn (via the preview if the kind has one), animate and collect one kind."""
+        world = self.world
+        pickups = world.pickups
+
+        spawned = None
+        if kind.due(self, dt):
+            kind.timer = 0
+            if kind.preview_ms:
+                kind.pending = PendingSpawn(world.sim_time, *kind.preview_position(self))
+            else:
+                spawned = kind.create(self.screen.screen)
+
+        # finalize spawn after the preview
+        pending = kind.pending
+        if pending is not None and world.sim_time - pending.t0 >= kind.preview_ms:
+            spawned = kind.create(self.screen.screen)
+            spawned.world_x = float(pending.x)
+            spawned.world_y = float(pending.y)
+            kind.pending = None
+
+        if spawned is not None:
+            kind.entity = spawned
+            pickups.insert(kind.name, spawned.world_x, spawned.world_y, spawned.radius)
+
+        entity = kind.entity
+        if entity is None:
+            return
+        entity.update(dt)
+        penguin = world.penguin
+        if kind.name in pickups.query_circle(penguin.world_x, penguin.world_y, penguin.radius):
+            events.append("pickup")
+            kind.collect(self)
+            kind.entity = None
+            pickups.remove(kind.name)
+
+    # --------------------------------------------------
+    # Camera
+    # --------------------------------------------------
+    def update_camera(self, player):
+        world = self.world
+        view_w, view_h = self.screen.width, self.screen.height
+        cam_x = world.camera_x
+        cam_y = world.camera_y
+
+        screen_cx = cam_x + view_w // 2
+        screen_cy = cam_y + view_h // 2
+
+        dz_half_w = self.deadzone_w // 2
+        dz_half_h = self.deadzone_h // 2
+
+        # Horizontal deadzone
+        if player.world_x < screen_cx - dz_half_w:
+            cam_x = player.world_x + dz_half_w - view_w // 2
+        elif player.world_x > screen_cx + dz_half_w:
+            cam_x = player.world_x - dz_half_w - view_w // 2
+
+        # Vertical deadzone
+        if player.world_y < screen_cy - dz_half_h:
+            cam_y = player.world_y + dz_half_h - view_h // 2
+        elif player.world_y > screen_cy + dz_half_h:
+            cam_y = player.world_y - dz_half_h - view_h // 2
+
+        # Smooth camera motion (important)
+        world.camera_x += (cam_x - world.camera_x) * 0.12
+        world.camera_y += (cam_y - world.camera_y) * 0.12
+
+    # --------------------------------------------------
+    # One simulation tick
+    # --------------------------------------------------
+    def step(self, inputs, dt):
+        """
+        Advance PLAYING by dt ms. inputs is anything indexable by pygame key
+        constants (pygame.key.get_pressed() or a KeyProxy).
+        Returns a list of event names.
+        """
+        events = []
+        if self.game_over:
+            return events
+
+        world = self.world
+        screen = self.screen
+        world.sim_time += dt
+        sim_now = world.sim_time
+
+        penguin = world.penguin
+
+        # remember where things were before the tick (for interpolation)
+        world.prev_camera = (world.camera_x, world.camera_y)
+        world.prev_penguin = (penguin.world_x, penguin.world_y)
+
+        # --------------------------------------------------
+        # EARLY PICKUPS (shovel: clears patches before they're used)
+        # --------------------------------------------------
+        for kind in world.kinds:
+            if kind.early:
+                self.update_pickup(kind, dt, events)
+                profiler.lap(kind.update_section)
+
+        # --------------------------------------------------
+        # SNOW PATCH PREVIEW -> WORLD SPAWN (WORLD-ANCHORED)
+        # --------------------------------------------------
+        if (not self.snowfall_active) and sim_now >= self.next_patch_time:
+            self.snowfall_active = True
+            self.snowfall_start_time = sim_now
+
+            # Choose a SCREEN position, but immediately convert to WORLD rect
+            screen_rect = pygame.Rect(
+                random.randint(0, max(0, screen.width - 200)),
+                random.randint(0, max(0, screen.height - 160)),
+                random.randint(160, 240),
+                random.randint(120, 190)
+            )
+
+            world_rect = pygame.Rect(
+                int(screen_rect.x + world.camera_x),
+                int(screen_rect.y + world.camera_y),
+                screen_rect.w,
+                screen_rect.h
+            )
+
+            world.pending_patch = world_rect
+
+            # Preview flakes are world-anchored too
+            self.preview_flakes.add("pending", world_rect)
+
+        if self.snowfall_active and world.pending_patch:
+            self.preview_flakes.update()
+
+            if sim_now - self.snowfall_start_time > PATCH_PREVIEW_MS:
+                self.snowfall_active = False
+
+                # Spawn the real patch in WORLD space
+                self.add_patch(SnowPatch(screen.screen, world.pending_patch, spawn_time=sim_now))
+
+                # cleanup
+                world.pending_patch = None
+                self.preview_flakes.remove("pending")
+                self.next_patch_time = sim_now + random.randint(PATCH_SPAWN_MIN, PATCH_SPAWN_MAX)
+
+        # cleanup expired patches (same lifetime: the oldest go first)
+        patches = self.snow_patches
+        while patches and patches[0].expired(sim_now):
+            self.remove_patch(patches[0])
+
+        self.patch_flakes.update()
+
+        profiler.lap("update.patches")
+
+        # --------------------------------------------------
+        # PLAYER (world movement + undertale camera)
+        # --------------------------------------------------
+        # Keep player screen-space centered relative to camera before update
+        cam_x, cam_y = world.camera_x, world.camera_y
+        penguin.x = penguin.world_x - cam_x
+        penguin.y = penguin.world_y - cam_y
+
+        # only patches around the penguin can touch its feet; their screen
+        # rects must match the camera the penguin is moved in
+        w, h = penguin.image.get_size()
+        reach = penguin.get_feet_hit_radius()
+        near = self.patches_in(
+            penguin.world_x - w / 2 - reach, penguin.world_y - h / 2 - reach,
+            penguin.world_x + w / 2 + reach, penguin.world_y + h / 2 + reach
+        )
+        for p in near:
+            p.set_camera(cam_x, cam_y)
+
+        old_x, old_y = penguin.x, penguin.y
+        penguin.update(inputs, dt, near)
+
+        # Convert screen delta -> world delta
+        penguin.world_x += (penguin.x - old_x)
+        penguin.world_y += (penguin.y - old_y)
+
+        # Apply camera follow AFTER player moves
+        self.update_camera(penguin)
+
+        profiler.lap("update.player")
+
+        # --------------------------------------------------
+        # PICKUPS (fish, pebble: world-aware)
+        # --------------------------------------------------
+        for kind in world.kinds:
+            if not kind.early:
+                self.update_pickup(kind, dt, events)
+                profiler.lap(kind.update_section)
+
+        # --------------------------------------------------
+        # SNOWBALLS (world-aware)
+        # --------------------------------------------------
+        world.spawn_timer += dt
+        delay_ms = max(250, (60 - world.score * 2 + world.spawn_delay_bonus) * 16)
+
+        snowballs = self.snowballs
+        if world.spawn_timer >= delay_ms:
+            snowballs.spawn(screen.width, screen.height, world.camera_x, world.camera_y, world.score)
+            world.spawn_timer = 0
+
+        # motion / collision / culling are batched over the whole field
+        snowballs.update()
+
+        if snowballs.collides_circle(penguin.world_x, penguin.world_y, penguin.radius):
+            if world.shield_count > 0:
+                world.shield_count -= 1
+                snowballs.clear()
+            else:
+                self.game_over = True
+                events.append("game_over")
+
+        # offscreen test in WORLD terms: if it's far behind camera
+        snowballs.cull(
+            world.camera_x - 200,
+            world.camera_y - 200,
+            world.camera_x + screen.width + 200,
+            world.camera_y + screen.height + 200,
+        )
+
+        profiler.lap("update.snowballs")
+
+        # --------------------------------------------------
+        # SCORE
+        # --------------------------------------------------
+        world.score_timer += dt
+        if world.score_timer >= 2000:
+            world.score += (2 if world.mult_active else 1)
+            world.score_timer = 0
+
+        if world.score > self.highscore:
+            self.highscore = world.score
+            world.new_high = True
+            events.append("new_highscore")
+
+        profiler.lap("update.score")
+        return events
+
+    # --------------------------------------------------
+    # GAME OVER: attract mode
+    # --------------------------------------------------
+    def start_attract(self):
+        screen = self.screen
+        go_penguin = Penguin(screen)
+        go_penguin.world_x = -200.0
+        go_penguin.world_y = float(screen.height // 2)
+
+        self.attract = Attract(go_penguin)
+        self.world.camera_x = 0.0
+        self.world.camera_y = 0.0
+        self.world.prev_camera = (0.0, 0.0)
+
+    def step_attract(self, dt):
+        attract = self.attract
+        screen = self.screen
+        pool = self.snowball_pool
+        go_penguin = attract.penguin
+
+        # remember where things were before the tick (for interpolation)
+        self.world.prev_camera = (self.world.camera_x, self.world.camera_y)
+        attract.prev_penguin = (go_penguin.world_x, go_penguin.world_y)
+
+        # Infinite background scroll
+        attract.bg_offset_x -= attract.BG_SCROLL
+
+        # Forward motion
+        go_penguin.world_x += 0.6
+
+        # Smooth dodge forces
+        vy = attract.vy
+        anchor_y = attract.anchor_y
+
+        force_y = 0.0
+        for sb in attract.snowballs:
+            dx = sb.world_x - go_penguin.world_x
+            if -240 < dx < 240:
+                dy = sb.world_y - go_penguin.world_y
+                force_y += (-dy / (dy * dy + 1200)) * 85000
+
+        force_y += (anchor_y - go_penguin.world_y) * 0.015
+        vy = (vy + force_y) * 0.88
+        vy = max(-2.2, min(2.2, vy))
+        go_penguin.world_y += vy
+        attract.vy = vy
+
+        self.update_camera(go_penguin)
+
+        # Spawn nonstop snowballs (full right side)
+        attract.spawn_timer += dt
+        if attract.spawn_timer > 180:
+            attract.spawn_timer = 0
+            sb = pool.acquire(screen.screen, self.world.score)
+            sb.world_x = go_penguin.world_x + screen.width + random.randint(0, 120)
+            sb.world_y = random.randint(
+                int(go_penguin.world_y - screen.height // 2),
+                int(go_penguin.world_y + screen.height // 2)
+            )
+            sb.vx = -random.uniform(1.8, 3.0)
+            attract.snowballs.append(sb)
+
+        kept = []
+        for sb in attract.snowballs:
+            sb.world_x += sb.vx
+            if sb.world_x < go_penguin.world_x - screen.width:
+                pool.release(sb)
+            else:
+                kept.append(sb)
+        attract.snowballs = kept
+
+        # walk animation only (position comes from world_x/world_y)
+        go_penguin.update(KeyProxy({pygame.K_RIGHT: True}), dt, [])
+        profiler.lap("update.attract")
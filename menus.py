@@ -0,0 +1,263 @@
+import pygame
+from textcache import render_text
+
+
+# --------------------------------------------------
+# Text helper
+# --------------------------------------------------
+
+def draw_centered_text(surface, text, font, color, y_offset=0):
+    rendered = render_text(font, text, color)
+    rect = rendered.get_rect(
+        center=(surface.get_width() // 2, surface.get_height() // 2 + y_offset)
+    )
+    surface.blit(rendered, rect)
+
+
+# --------------------------------------------------
+# Cached layer
+# --------------------------------------------------
+
+class MenuLayer:
+    """
+    A full-screen surface holding one fully rendered menu (floor included).
+    It is re-rendered only when the key (selection, owned skins, fish total,
+    volumes, window size, ...) differs from the last call; otherwise the
+    cached surface is returned and the menu costs a single blit.
+    """
+
+    def __init__(self, render):
+        self.render = render
+        self.key = None
+        self.surface = None
+        self.rebuilds = 0
+
+    def get(self, size, key, *args):
+        full_key = (size, key)
+        if self.surface is None or full_key != self.key:
+            if self.surface is None or self.surface.get_size() != size:
+                self.surface = pygame.Surface(size).convert()
+            self.render(self.surface, *args)
+            self.key = full_key
+            self.rebuilds += 1
+        return self.surface
+
+    def invalidate(self):
+        self.key = None
+
+
+# --------------------------------------------------
+# START
+# --------------------------------------------------
+
+def render_start_menu(surface, background, font, big_font, title_img, total_fish):
+    width, height = surface.get_size()
+    background.draw(surface)
+
+    # ---------- TITLE IMAGE (BACKGROUND PLATE) ----------
+    # move the sign DOWN a bit
+    title_rect = title_img.get_rect(
+        center=(width // 2, int(height * 0.5))
+    )
+    surface.blit(title_img, title_rect)
+
+    # ---------- TITLE TEXT (ON TOP OF SIGN, LOWERED) ----------
+    title_text = big_font.render("Dodgy Penguin", True, (255, 25, 24))
+    title_text_rect = title_text.get_rect(
+        center=(title_rect.centerx, title_rect.centery - 200)
+    )
+    surface.blit(title_text, title_text_rect)
+
+    # ---------- MENU TEXT (CLOSER TO TITLE) ----------
+    base_y = title_rect.bottom - 300
+    line_gap = 30
+
+    draw_centered_text(
+        surface,
+        "[ SPACE ]  START GAME",
+        font,
+        (20, 162, 18),
+        base_y - height // 2
+    )
+
+    draw_centered_text(
+        surface,
+        "[ S ]      SKINS",
+        font,
+        (253, 162, 18),
+        base_y - height // 2 + line_gap
+    )
+
+    draw_centered_text(
+        surface,
+        "[ V ]      VOLUME",
+        font,
+        (67, 1, 105),
+        base_y - height // 2 + line_gap * 2
+    )
+
+    # ---------- TOTAL FISH ----------
+    draw_centered_text(
+        surface,
+        f"TOTAL FISH: {total_fish}",
+        font,
+        (0, 100, 200),
+        base_y - height // 2 + line_gap * 4
+    )
+
+
+# --------------------------------------------------
+# SKIN MENU
+# --------------------------------------------------
+
+def render_skin_menu(surface, background, font, big_font, ctrl_font,
+                     skins, selected_skin, owned_skins, prices, total_fish,
+                     skin_previews, fish_icon, controls_bg):
+    width, height = surface.get_size()
+    background.draw(surface)
+
+    # ---------- COLORS ----------
+    UI_BLUE = (20, 60, 120)
+    TITLE_COLOR = (253, 162, 18)
+
+    # ---------- TITLE ----------
+    draw_centered_text(
+        surface,
+        "SELECT SKIN",
+        big_font,
+        TITLE_COLOR,
+        -int(height * 0.45)
+    )
+
+    # ---------- LAYOUT (MOVED UP) ----------
+    cx = width // 2
+    cy = height // 2 - int(height * 0.08)
+
+    sprite_size = int(min(width, height) * 0.18)
+    spacing = int(sprite_size * 1.7)
+
+    y_sprite = cy - int(sprite_size * 0.15)
+    y_name = y_sprite + sprite_size // 2 + 16
+    y_status = y_name + 24
+
+    total_width = spacing * (len(skins) - 1)
+    start_x = cx - total_width // 2
+
+    # ---------- SKINS ----------
+    for i, skin in enumerate(skins):
+        x = start_x + i * spacing
+
+        selected = (skin == selected_skin)
+        owned = skin in owned_skins
+        price = prices.get(skin, 0)
+
+        preview = pygame.transform.scale(
+            skin_previews[skin],
+            (sprite_size, sprite_size)
+        )
+
+        if selected:
+            box = sprite_size + 14
+            pygame.draw.rect(
+                surface,
+                UI_BLUE,
+                pygame.Rect(
+                    x - box // 2,
+                    y_sprite - box // 2,
+                    box,
+                    box
+                ),
+                3
+            )
+
+        surface.blit(
+            preview,
+            preview.get_rect(center=(x, y_sprite))
+        )
+
+        name = font.render(skin.upper(), True, UI_BLUE if selected else (0, 0, 0))
+        surface.blit(name, name.get_rect(center=(x, y_name)))
+
+        if owned:
+            owned_txt = font.render("OWNED", True, (0, 160, 0))
+            surface.blit(owned_txt, owned_txt.get_rect(center=(x, y_status)))
+        else:
+            price_txt = font.render(str(price), True, (200, 50, 50))
+            surface.blit(price_txt, price_txt.get_rect(center=(x - 12, y_status)))
+            surface.blit(
+                fish_icon,
+                fish_icon.get_rect(center=(x + 22, y_status))
+            )
+
+    # ---------- TOTAL FISH ----------
+    total_txt = font.render(f"TOTAL FISH: {total_fish}", True, UI_BLUE)
+    surface.blit(
+        total_txt,
+        total_txt.get_rect(center=(cx, height * 0.60))
+    )
+
+    # ---------- CONTROLS PANEL ----------
+    panel_width = 650
+    panel_height = 200
+
+    panel = pygame.transform.scale(controls_bg, (panel_width, panel_height))
+    panel_rect = panel.get_rect(center=(cx, height * 0.82))
+    surface.blit(panel, panel_rect)
+
+    # ---------- PANEL SAFE AREA ----------
+    inner_left = panel_rect.left + 60
+    inner_right = panel_rect.right - 60
+    key_y = panel_rect.centery - 40
+    label_y = key_y + 18
+
+    # ---------- KEY BOX ----------
+    def draw_key_box(text, x, y):
+        surf = ctrl_font.render(text, True, UI_BLUE)
+        rect = surf.get_rect(center=(x, y))
+        box = rect.inflate(8, 8)
+        pygame.draw.rect(surface, UI_BLUE, box, 2)
+        surface.blit(surf, rect)
+
+    # ---------- CONTROLS ----------
+    controls = [
+        ("A / D", ["SELECT"]),
+        ("ENTER", ["BUY", "SELECT"]),
+        ("ESC", ["BACK"]),
+    ]
+
+    slot_w = (inner_right - inner_left) // len(controls)
+
+    for i, (key, labels) in enumerate(controls):
+        x = inner_left + slot_w * i + slot_w // 2
+
+        draw_key_box(key, x, key_y)
+
+        for j, line in enumerate(labels):
+            lbl = ctrl_font.render(line, True, UI_BLUE)
+            surface.blit(
+                lbl,
+                lbl.get_rect(center=(x, label_y + j * 16))
+            )
+
+
+# --------------------------------------------------
+# VOLUME MENU
+# --------------------------------------------------
+
+def render_volume_menu(surface, background, font, big_font, vol_items, vol_index, values):
+    background.draw(surface)
+    draw_centered_text(surface, "Volume", big_font, (0, 0, 0), -160)
+
+    y0 = -40
+    for i, item in enumerate(vol_items):
+        y = y0 + i * 45
+        selected = (i == vol_index)
+        col = (0, 120, 200) if selected else (0, 0, 0)
+
+        if item == "Back":
+            draw_centered_text(surface, "Back", font, col, y)
+        else:
+            pct = int(values[item] * 100)
+            draw_centered_text(surface, f"{item}: {pct}%  (L/R)", font, col, y)
+
+    draw_centered_text(surface, "ESC to return", font, (0, 0, 0), 200)
@@ -0,0 +1,209 @@
+import random
+from itertools import repeat
+
+import numpy as np
+import pygame
+
+
+FLAKE_COLOR = (255, 255, 255)
+_flake_sprites = {}
+
+
+def flake_sprite(size):
+    """
+    White dot of radius size, pixel-identical to pygame.draw.circle.
+    Colorkeyed + RLE (flakes are fully opaque), which blits a lot faster
+    than per-pixel alpha. Needs a display (convert()).
+    Returns (surface, offset_x, offset_y): blit at (x - offset_x, y - offset_y).
+    """
+    sprite = _flake_sprites.get(size)
+    if sprite is None:
+        c = size + 1
+        canvas = pygame.Surface((c * 2, c * 2)).convert()
+        canvas.fill((0, 0, 0))
+        rect = pygame.draw.circle(canvas, FLAKE_COLOR, (c, c), size)
+        surf = canvas.subsurface(rect).copy()
+        surf.set_colorkey((0, 0, 0), pygame.RLEACCEL)
+        sprite = _flake_sprites[size] = (surf, c - rect.x, c - rect.y)
+    return sprite
+
+
+# -------------------------
+# Flake field (struct of arrays, grouped by emitter)
+# -------------------------
+class FlakeField:
+    """
+    Falling snow flakes for many emitters in contiguous NumPy arrays
+    (world space). Every emitter owns one fixed block of per_emitter slots,
+    so add() / remove() are O(1) (blocks go on a free list) and update() /
+    draw() are array ops over all blocks at once.
+
+    An emitter is a world rect: flakes start at a random x across it,
+    up to spawn_height above its top, and fall at a random speed. With
+    respawn, a flake that passes the bottom starts over from the top.
+    """
+
+    def __init__(self, per_emitter, spawn_height=20, speed=(0.3, 1.0), sizes=(1, 3),
+                 respawn=True, capacity=8):
+        self.per_emitter = per_emitter
+        self.spawn_height = spawn_height
+        self.speed_range = speed
+        self.sizes = sizes
+        self.respawn = respawn
+
+        self.capacity = 0
+        self.high = 0      # blocks in use are all < high
+        self.free = []
+        self.emitters = {}  # key -> block
+        self.drawn = 0      # last draw(): flakes blitted / skipped as off-view
+        self.culled = 0
+        # seeded from `random`, so random.seed() makes runs repeatable
+        self.rng = np.random.default_rng(random.getrandbits(32))
+        self._allocate(capacity)
+
+    def __len__(self):
+        """Live flakes."""
+        return len(self.emitters) * self.per_emitter
+
+    def _allocate(self, capacity):
+        def grow(arr, shape, dtype):
+            out = np.zeros(shape, dtype=dtype)
+            if arr is not None:
+                out[:len(arr)] = arr
+            return out
+
+        old = self.capacity > 0
+        shape = (capacity, self.per_emitter)
+        self.x = grow(self.x if old else None, shape, np.float64)
+        self.y = grow(self.y if old else None, shape, np.float64)
+        self.prev_y = grow(self.prev_y if old else None, shape, np.float64)  # before the last update()
+        self.speed = grow(self.speed if old else None, shape, np.float64)
+        self.size = grow(self.size if old else None, shape, np.int64)
+        self.alive = grow(self.alive if old else None, capacity, np.bool_)
+        self.bounds = grow(self.bounds if old else None, (capacity, 4), np.int64)  # l, t, r, b
+        self.capacity = capacity
+
+    # --------------------------------------------------
+    # Emitters
+    # --------------------------------------------------
+
+    def add(self, key, world_rect):
+        """Start an emitter (key: anything hashable, e.g. the SnowPatch)."""
+        if key in self.emitters:
+            self.remove(key)
+        if self.free:
+            block = self.free.pop()
+        else:
+            if self.high == self.capacity:
+                self._allocate(self.capacity * 2)
+            block = self.high
+            self.high += 1
+
+        self.emitters[key] = block
+        self.alive[block] = True
+        self.bounds[block] = (world_rect.left, world_rect.top, world_rect.right, world_rect.bottom)
+        mask = np.zeros((self.capacity, self.per_emitter), dtype=np.bool_)
+        mask[block] = True
+        self._spawn(mask)
+        return block
+
+    def remove(self, key):
+        block = self.emitters.pop(key, None)
+        if block is None:
+            return
+        self.alive[block] = False
+        if not self.emitters:
+            self.clear()
+        else:
+            self.free.append(block)
+
+    def clear(self):
+        self.alive[:self.high] = False
+        self.high = 0
+        self.free.clear()
+        self.emitters.clear()
+
+    def _spawn(self, mask):
+        """(Re)start the flakes selected by a (blocks, per_emitter) mask."""
+        rows = np.nonzero(mask)[0]
+        count = len(rows)
+        if count == 0:
+            return
+        left, top, right, _ = self.bounds[rows].T
+        rng = self.rng
+        self.x[mask] = rng.integers(left, right + 1)
+        self.y[mask] = rng.integers(top - self.spawn_height, top + 1)
+        self.prev_y[mask] = self.y[mask]
+        self.speed[mask] = rng.uniform(*self.speed_range, size=count)
+        self.size[mask] = rng.integers(self.sizes[0], self.sizes[1] + 1, size=count)
+
+    # --------------------------------------------------
+    # Simulation / draw
+    # --------------------------------------------------
+
+    def update(self):
+        """One simulation tick."""
+        n = self.high
+        if not self.emitters:
+            return
+        self.prev_y[:n] = self.y[:n]
+        self.y[:n] += self.speed[:n]
+        if self.respawn:
+            bottom = self.bounds[:n, 3]
+            passed = (self.y[:n] > bottom[:, None]) & self.alive[:n, None]
+            if passed.any():
+                mask = np.zeros((self.capacity, self.per_emitter), dtype=np.bool_)
+                mask[:n] = passed
+                self._spawn(mask)
+
+    def draw(self, surface, camera_x, camera_y, alpha=1.0, return_rects=False):
+        """
+        Blit every flake inside the view: one Surface.blits() call per flake
+        size, fed straight from the coordinate arrays. alpha interpolates
+        between the previous and the current update(). With return_rects,
+        returns one rect per emitter around its visible flakes.
+        """
+        n = self.high
+        self.drawn = self.culled = 0
+        if not self.emitters:
+            return []
+
+        sx = (self.x[:n] - camera_x).astype(np.int64)
+        y = self.y[:n]
+        if alpha < 1.0:
+            py = self.prev_y[:n]
+            y = py + (y - py) * alpha
+        sy = (y - camera_y).astype(np.int64)
+        w, h = surface.get_size()
+        reach = self.sizes[1] + 1
+        visible = (
+            self.alive[:n, None] &
+            (sx > -reach) & (sx < w + reach) & (sy > -reach) & (sy < h + reach)
+        )
+        self.drawn = int(visible.sum())
+        self.culled = len(self) - self.drawn
+        if not self.drawn:
+            return []
+
+        size = self.size[:n]
+        for s in range(self.sizes[0], self.sizes[1] + 1):
+            pick = visible & (size == s)
+            if not pick.any():
+                continue
+            sprite, ox, oy = flake_sprite(s)
+            xs = (sx[pick] - ox).tolist()
+            ys = (sy[pick] - oy).tolist()
+            surface.blits(zip(repeat(sprite), zip(xs, ys)), False)
+
+        if not return_rects:
+            return []
+        big = np.iinfo(np.int64).max
+        rows = np.flatnonzero(visible.any(axis=1))
+        left = np.where(visible, sx, big).min(axis=1)[rows] - reach
+        top = np.where(visible, sy, big).min(axis=1)[rows] - reach
+        right = np.where(visible, sx, -big).max(axis=1)[rows] + reach
+        bottom = np.where(visible, sy, -big).max(axis=1)[rows] + reach
+        return [
+            pygame.Rect(l, t, r - l, b - t)
+            for l, t, r, b in zip(left.tolist(), top.tolist(), right.tolist(), bottom.tolist())
+        ]
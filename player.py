@@ -1,5 +1,8 @@
 import pygame
-from utils import resource_path, calculate_foot_ratio, circle_rect_overlap
+import sprites
+import spritemetrics
+from atlas import atlas, SpriteBatch
+from utils import circle_rect_overlap
 
 
 # --------------------------------------------------
@@ -20,6 +23,97 @@ def set_selected_skin(name):
     SELECTED_SKIN = name
 
 
+# --------------------------------------------------
+# Skin animation bundles
+# --------------------------------------------------
+
+SKIN_SHEETS = {
+    "down":       "walk_down.png",
+    "down_left":  "walk_downL.png",
+    "down_right": "walk_downR.png",
+    "left":       "walk_left.png",
+    "right":      "walk_right.png",
+    "up":         "walk_up.png",
+    "up_left":    "walk_upL.png",
+    "up_right":   "walk_upR.png",
+}
+SKIN_FRAME_SIZE = (32, 32)
+SKIN_FRAMES_PER_SHEET = 3
+SHADOW_ALPHA_THRESHOLD = 127  # same as pygame.mask.from_surface
+
+_bundles = {}
+
+
+class SkinBundle:
+    """
+    Everything a Penguin needs from its skin: scaled frames per direction,
+    foot ratios, shadow x offsets and the hit radius. Built once per skin
+    and shared by every Penguin (treat as read-only).
+    """
+
+    def __init__(self, skin):
+        skin_cfg = SKINS.get(skin, SKINS["default"])
+        scale = skin_cfg["scale"]
+        skin_path = f"assets/animations/{skin}/"
+
+        self.skin = skin
+        self.frames = {}
+        self.foot_ratios = {}
+        self.shadow_x_offsets = {}
+
+        for key, filename in SKIN_SHEETS.items():
+            sheet = (skin_path + filename, SKIN_FRAMES_PER_SHEET, 1)
+            frames = sprites.load_frames(*sheet, scale=scale, frame_size=SKIN_FRAME_SIZE)
+            feet = spritemetrics.sheet_metrics(*sheet, scale=scale, frame_size=SKIN_FRAME_SIZE)
+
+            self.frames[key] = frames
+            self.foot_ratios[key] = [m.feet_y / f.get_height() for m, f in zip(feet, frames)]
+            self.shadow_x_offsets[key] = calc_shadow_x_offsets(skin, *sheet, scale, frames)
+
+        image = self.frames["down"][0]
+        fallback_radius = int(min(image.get_width(), image.get_height()) * 0.35)
+        self.radius = int(skin_cfg.get("radius", fallback_radius))
+
+
+def calc_shadow_x_offsets(skin, path, cols, rows, scale, frames) -> list:
+    """Shadow X offsets (DEFAULT SKIN ONLY): opaque bbox centre vs frame centre."""
+    if skin != "default":
+        return [0.0] * len(frames)
+
+    metrics = spritemetrics.sheet_metrics(
+        path, cols, rows, scale=scale, frame_size=SKIN_FRAME_SIZE,
+        threshold=SHADOW_ALPHA_THRESHOLD
+    )
+    return [
+        m.bbox.centerx - (f.get_width() / 2.0) if m.opaque else 0.0
+        for m, f in zip(metrics, frames)
+    ]
+
+
+def get_skin_bundle(skin) -> SkinBundle:
+    """Shared bundle for a skin, built on first use (main thread only)."""
+    bundle = _bundles.get(skin)
+    if bundle is None:
+        bundle = _bundles[skin] = SkinBundle(skin)
+    return bundle
+
+
+def preload_skin(skin):
+    """
+    Decode a skin's sheets on a background thread (e.g. when highlighted in
+    SKIN_MENU), so building its bundle later skips the file decoding. The
+    main loop must call sprites.drain_prefetched() every frame.
+    """
+    if skin in _bundles:
+        return
+    scale = SKINS.get(skin, SKINS["default"])["scale"]
+    sprites.prefetch_images([
+        sprites.sheet_image_path(f"assets/animations/{skin}/{filename}", SKIN_FRAMES_PER_SHEET, 1,
+                                 scale=scale, frame_size=SKIN_FRAME_SIZE)
+        for filename in SKIN_SHEETS.values()
+    ])
+
+
 # --------------------------------------------------
 # Penguin
 # --------------------------------------------------
@@ -30,65 +124,21 @@ class Penguin:
 
         self.x = self.screen.width // 2
         self.y = self.screen.height // 2
+        self.world_x = float(self.x)
+        self.world_y = float(self.y)
 
         self.vx = 0.0
         self.vy = 0.0
         self.speed = 0.5
         self.friction = 0.9
 
-        skin_cfg = SKINS.get(SELECTED_SKIN, SKINS["default"])
-        scale = skin_cfg["scale"]
-        skin_path = f"assets/animations/{SELECTED_SKIN}/"
-
-        # load sheets
-        sheets = {
-            "down":       pygame.image.load(resource_path(skin_path + "walk_down.png")).convert_alpha(),
-            "down_left":  pygame.image.load(resource_path(skin_path + "walk_downL.png")).convert_alpha(),
-            "down_right": pygame.image.load(resource_path(skin_path + "walk_downR.png")).convert_alpha(),
-            "left":       pygame.image.load(resource_path(skin_path + "walk_left.png")).convert_alpha(),
-            "right":      pygame.image.load(resource_path(skin_path + "walk_right.png")).convert_alpha(),
-            "up":         pygame.image.load(resource_path(skin_path + "walk_up.png")).convert_alpha(),
-            "up_left":    pygame.image.load(resource_path(skin_path + "walk_upL.png")).convert_alpha(),
-            "up_right":   pygame.image.load(resource_path(skin_path + "walk_upR.png")).convert_alpha(),
-        }
-
-        frame_w, frame_h = 32, 32
-
-        # frames + cached data
-        self.frames = {k: [] for k in sheets}
-        self.foot_ratios = {k: [] for k in sheets}
-        self.shadow_x_offsets = {k: [] for k in sheets}
-
-        # ----------------------------------------------
-        # Helper: shadow X offset (DEFAULT SKIN ONLY)
-        # ----------------------------------------------
-        def calc_shadow_x_offset(frame: pygame.Surface) -> float:
-            if SELECTED_SKIN != "default":
-                return 0.0
-
-            mask = pygame.mask.from_surface(frame)
-            rects = mask.get_bounding_rects()
-            if not rects:
-                return 0.0
-
-            bbox = rects[0].copy()
-            for r in rects[1:]:
-                bbox.union_ip(r)
-
-            return bbox.centerx - (frame.get_width() / 2.0)
-
-        # load frames
-        for key, sheet in sheets.items():
-            for i in range(3):
-                frame = sheet.subsurface((i * frame_w, 0, frame_w, frame_h))
-                frame = pygame.transform.scale(
-                    frame,
-                    (int(frame_w * scale), int(frame_h * scale))
-                )
-
-                self.frames[key].append(frame)
-                self.foot_ratios[key].append(calculate_foot_ratio(frame))
-                self.shadow_x_offsets[key].append(calc_shadow_x_offset(frame))
+        # frames + cached data (shared per skin, read-only)
+        bundle = get_skin_bundle(SELECTED_SKIN)
+        self.frames = bundle.frames
+        self.foot_ratios = bundle.foot_ratios
+        self.shadow_x_offsets = bundle.shadow_x_offsets
+        # atlas regions (atlas.frames() is memoized per frame list)
+        self.regions = {key: atlas.frames(frames) for key, frames in self.frames.items()}
 
         # initial state
         self.direction = "down"
@@ -97,11 +147,11 @@ class Penguin:
         self.frame_delay = 150
 
         self.image = self.frames["down"][0]
+        self.region = self.regions["down"][0]
         self.foot_ratio = self.foot_ratios["down"][0]
         self.shadow_x_offset = self.shadow_x_offsets["down"][0]
 
-        fallback_radius = int(min(self.image.get_width(), self.image.get_height()) * 0.35)
-        self.radius = int(skin_cfg.get("radius", fallback_radius))
+        self.radius = bundle.radius
 
     # --------------------------------------------------
     # Helpers
@@ -123,6 +173,7 @@ class Penguin:
         self.direction = direction
         self.current_frame = frame_index
         self.image = self.frames[direction][frame_index]
+        self.region = self.regions[direction][frame_index]
         self.foot_ratio = self.foot_ratios[direction][frame_index]
         self.shadow_x_offset = self.shadow_x_offsets[direction][frame_index]
 
@@ -130,8 +181,9 @@ class Penguin:
     # Draw
     # --------------------------------------------------
 
-    def draw(self):
-        surf = self.screen.screen
+    def draw(self, batch=None):
+        """Queue into batch (a SpriteBatch), or blit now. Returns the rect covered."""
+        out = batch if batch is not None else SpriteBatch()
 
         # shadow (perfectly grounded + centered)
         _, fy = self.get_feet_pos()
@@ -140,15 +192,17 @@ class Penguin:
         shadow_w = int(self.radius * 1.5)
         shadow_h = int(self.radius * 0.75)
 
-        shadow = pygame.Surface((shadow_w, shadow_h), pygame.SRCALPHA)
-        pygame.draw.ellipse(shadow, (0, 0, 0, 90), shadow.get_rect())
+        shadow = sprites.get_shadow(shadow_w, shadow_h, 90)
 
-        surf.blit(
+        rect = out.add(
             shadow,
             (int(fx - shadow_w / 2), int(fy - shadow_h // 2))
         )
 
-        surf.blit(self.image, self.get_rect())
+        rect.union_ip(out.add_region(self.region, self.get_rect()))
+        if batch is None:
+            out.flush(self.screen.screen)
+        return rect
 
     # --------------------------------------------------
     # Update
@@ -0,0 +1,230 @@
+import csv
+import time
+from collections import deque
+
+import pygame
+
+import sprites
+from textcache import text_cache
+from utils import get_save_path
+
+
+# ===============================
+# FRAME SECTIONS
+# ===============================
+
+# CSV column order; lap() names outside this list still show in the overlay
+SECTIONS = (
+    "events",
+    "update.shovel", "update.patches", "update.player",
+    "update.fish", "update.pebble", "update.snowballs", "update.score",
+    "draw.background", "draw.shovel", "draw.patches", "draw.player",
+    "draw.fish", "draw.pebble", "draw.sprites", "draw.snowballs", "draw.hud",
+    "update.attract", "draw.game_over",
+    "menu", "overlay", "display",
+)
+
+HISTORY = 120          # frames kept for rolling averages / the graph
+OVERLAY_REFRESH = 15   # frames between overlay text updates
+BUDGET_MS = 1000.0 / 60
+
+
+# ===============================
+# CACHE STATS (overlay)
+# ===============================
+
+def _hit_rate(hits, misses):
+    lookups = hits + misses
+    return f"{hits / lookups:4.0%} ({hits}/{misses})" if lookups else "   - (0/0)"
+
+
+def cache_lines():
+    """Overlay lines: hit rate (hits/misses) of the sprite and text caches."""
+    sprite = sprites.cache_stats()
+    text = text_cache.stats()
+    return [
+        f"sprites {_hit_rate(sprite['hits'], sprite['misses'])}",
+        f"shadows {_hit_rate(sprite['shadow_hits'], sprite['shadow_misses'])}",
+        f"text {_hit_rate(text['hits'], text['misses'])}",
+        f"glyphs {_hit_rate(text['glyph_hits'], text['glyph_misses'])}",
+    ]
+
+
+# ===============================
+# PROFILER
+# ===============================
+
+class FrameProfiler:
+    """
+    Lap timer for the main loop. Call begin() at the top of a frame,
+    lap(name) after each section (time since the previous lap is added to
+    name, so a section can lap several times per frame, e.g. one per sim
+    step) and end() once the frame is presented.
+
+    Does nothing until the overlay or CSV recording is switched on; the
+    disabled cost is one attribute check per lap. Switching on mid-frame
+    (F3 / F4 are handled after begin()) takes effect from the next begin(),
+    so no frame is timed from a stale start.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.overlay = False
+        self._csv_file = None
+        self._csv = None
+        self.csv_path = None
+
+        self.frame_no = 0
+        self._started = False  # begin() ran while enabled: this frame is timed
+        self._t0 = 0.0
+        self._last = 0.0
+        self._current = {}
+
+        self.totals = deque(maxlen=HISTORY)
+        self.history = deque(maxlen=HISTORY)  # per-frame {section: ms}
+
+        self._overlay_lines = []
+        self._overlay_age = OVERLAY_REFRESH
+
+    # --------------------------------------------------
+    # Switches
+    # --------------------------------------------------
+
+    def _update_enabled(self):
+        self.enabled = self.overlay or self._csv is not None
+
+    def toggle_overlay(self):
+        self.overlay = not self.overlay
+        self._overlay_age = OVERLAY_REFRESH
+        self._update_enabled()
+
+    def start_csv(self, filename=None):
+        """Stream one row per frame to a CSV file in the saves directory."""
+        self.stop_csv()
+        if filename is None:
+            filename = time.strftime("profile-%Y%m%d-%H%M%S.csv")
+        self.csv_path = get_save_path(filename)
+        self._csv_file = open(self.csv_path, "w", newline="")
+        self._csv = csv.writer(self._csv_file)
+        self._csv.writerow(("frame", "total_ms") + SECTIONS)
+        self._update_enabled()
+        return self.csv_path
+
+    def stop_csv(self):
+        if self._csv_file is not None:
+            self._csv_file.close()
+        self._csv_file = None
+        self._csv = None
+        self._update_enabled()
+
+    def toggle_csv(self):
+        if self._csv is None:
+            return self.start_csv()
+        self.stop_csv()
+        return None
+
+    # --------------------------------------------------
+    # Timing hooks
+    # --------------------------------------------------
+
+    def begin(self):
+        self._started = self.enabled
+        if not self._started:
+            return
+        self._t0 = self._last = time.perf_counter()
+        self._current = {}
+
+    def lap(self, name):
+        if not self._started:
+            return
+        now = time.perf_counter()
+        current = self._current
+        current[name] = current.get(name, 0.0) + (now - self._last) * 1000.0
+        self._last = now
+
+    def end(self):
+        if not self._started:
+            return
+        self._started = False
+        total = (time.perf_counter() - self._t0) * 1000.0
+        self.frame_no += 1
+        self.totals.append(total)
+        self.history.append(self._current)
+
+        if self._csv is not None:
+            current = self._current
+            self._csv.writerow(
+                [self.frame_no, f"{total:.3f}"] +
+                [f"{current.get(name, 0.0):.3f}" for name in SECTIONS]
+            )
+
+    def averages(self) -> dict:
+        """Rolling mean ms per section over the last HISTORY frames."""
+        frames = len(self.history)
+        sums = {}
+        for record in self.history:
+            for name, ms in record.items():
+                sums[name] = sums.get(name, 0.0) + ms
+        return {name: ms / frames for name, ms in sums.items()} if frames else {}
+
+    # --------------------------------------------------
+    # Overlay
+    # --------------------------------------------------
+
+    def draw_overlay(self, surface, text, extra=()):
+        """
+        Rolling section averages, cache hit rates and a frame-time graph,
+        top right.
+        text is a GlyphAtlas (see textcache) so numbers don't churn the
+        text cache. extra: more lines (e.g. counters), refreshed with the
+        averages. Returns the panel rect.
+        """
+        if not self.overlay:
+            return None
+
+        self._overlay_age += 1
+        if self._overlay_age >= OVERLAY_REFRESH:
+            self._overlay_age = 0
+            avgs = self.averages()
+            total = sum(self.totals) / len(self.totals) if self.totals else 0.0
+            lines = [f"frame {total:5.2f} ms"]
+            for name in sorted(avgs, key=avgs.get, reverse=True):
+                if avgs[name] >= 0.01:
+                    lines.append(f"{name} {avgs[name]:5.2f}")
+            lines.extend(cache_lines())
+            lines.extend(extra)
+            if self._csv is not None:
+                lines.append("CSV on")
+            self._overlay_lines = lines
+
+        line_h = text.height
+        graph_h = 60
+        width = 230
+        height = len(self._overlay_lines) * line_h + graph_h + 16
+        left = surface.get_width() - width - 8
+        top = 8
+
+        panel = pygame.Rect(left, top, width, height)
+        surface.fill((255, 255, 255), panel)
+        pygame.draw.rect(surface, (0, 0, 0), panel, 1)
+
+        y = top + 4
+        for line in self._overlay_lines:
+            text.draw(surface, line, (left + 6, y))
+            y += line_h
+
+        # frame-time graph: one bar per frame, budget line at 60 FPS
+        graph = pygame.Rect(left + 6, y + 4, width - 12, graph_h)
+        scale = graph_h / (BUDGET_MS * 2)
+        bar_w = max(1, graph.width // HISTORY)
+        for i, ms in enumerate(self.totals):
+            h = min(graph_h, int(ms * scale))
+            color = (200, 40, 40) if ms > BUDGET_MS else (40, 140, 40)
+            surface.fill(color, (graph.left + i * bar_w, graph.bottom - h, bar_w, h))
+        budget_y = graph.bottom - int(BUDGET_MS * scale)
+        pygame.draw.line(surface, (0, 0, 0), (graph.left, budget_y), (graph.right, budget_y))
+        return panel
+
+
+# shared instance used by the game
+profiler = FrameProfiler()
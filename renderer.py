@@ -0,0 +1,265 @@
+import math
+
+import pygame
+
+import sprites
+from menus import draw_centered_text
+from textcache import text_cache
+from profiler import profiler
+from dirty import DirtyRects
+from atlas import atlas, SpriteBatch
+from culling import ViewCuller
+from snowballs import SnowballField
+
+
+# -------------------------
+# HUD layout helpers (centered rows)
+# -------------------------
+HUD_X = 10
+SCORE_POS = (10, 10)
+
+FISH_ROW_Y = 80        # centerline
+PEBBLE_ROW_Y = 140     # centerline
+PEBBLE_SPACING = 12
+
+
+def lerp(a, b, t):
+    return a + (b - a) * t
+
+
+def half_extent(entity):
+    """(half_w, half_h) of a square around a pickup's frame (its shadow fits inside)."""
+    w, h = entity.frames[0].get_size()
+    half = max(w, h) / 2
+    return half, half
+
+
+# --------------------------------------------------
+# PLAYING / GAME OVER renderer
+# --------------------------------------------------
+class GameRenderer:
+    """
+    Draws a GameState (PLAYING, interpolated) and the GAME_OVER attract
+    mode. Holds only fonts / icons / background; all state is read from
+    the GameState passed in, so run_game and bench.py share it.
+
+    Sprites are queued per layer into a SpriteBatch (atlas regions) and
+    drawn with one Surface.blits() call per layer (flakes and snowballs
+    batch their own); HUD box outlines stay immediate.
+
+    World entities outside the camera view are skipped before any draw
+    work; self.culler counts drawn / culled per kind for the last frame.
+
+    Everything drawn is reported to self.dirty (a no-op unless the
+    dirty-rect present is enabled).
+    """
+
+    def __init__(self, screen, background, font, big_font, fish_icon, pebble_icon, dirty=None):
+        self.screen = screen
+        self.background = background
+        self.font = font
+        self.big_font = big_font
+        self.fish_icon = fish_icon
+        self.pebble_icon = pebble_icon
+        self.fish_region = atlas.region(fish_icon)
+        self.pebble_region = atlas.region(pebble_icon)
+        self.batch = SpriteBatch()
+        self.culler = ViewCuller()
+
+        # score / fish counters change often: draw them glyph by glyph
+        self.hud_text = text_cache.glyph_atlas(font, (0, 0, 0))
+        self.dirty = dirty if dirty is not None else DirtyRects()
+        self._hud_key = None
+        self._hud_rects = []
+
+    # -------------------------
+    # Preview drawing (dim circle in world space)
+    # -------------------------
+    def draw_world_preview_circle(self, world_x, world_y, radius, alpha, camera_x, camera_y, pulse=0.0, batch=None):
+        # convert world -> screen
+        sx = int(world_x - camera_x)
+        sy = int(world_y - camera_y)
+
+        r = max(1, int(radius + pulse))
+        surf = sprites.get_circle(r, alpha)
+        if batch is not None:
+            return batch.add(surf, (sx - r, sy - r))
+        return self.screen.screen.blit(surf, (sx - r, sy - r))
+
+    # -------------------------
+    # PLAYING: render (interpolated)
+    # -------------------------
+    def draw_pickups(self, game, layer, cam_x, cam_y, now):
+        """Preview circles + pickups of every kind on one layer (queued into self.batch)."""
+        dirty = self.dirty
+        batch = self.batch
+        culler = self.culler
+        for kind in game.world.kinds:
+            if kind.layer != layer:
+                continue
+
+            pending = kind.pending
+            if pending is not None:
+                radius = kind.preview_radius
+                if culler.visible("previews", pending.x, pending.y, radius + 2, radius + 2):
+                    pulse = 2.0 * (0.5 + 0.5 * math.sin(now * 0.015))
+                    dirty.add(self.draw_world_preview_circle(pending.x, pending.y, radius, 45, cam_x, cam_y, pulse=pulse, batch=batch))
+
+            entity = kind.entity
+            if entity is not None and culler.visible(kind.name, entity.world_x, entity.world_y, *half_extent(entity)):
+                entity.x = entity.world_x - cam_x
+                entity.y = entity.world_y - cam_y
+                dirty.add(entity.draw(batch))
+            profiler.lap(kind.draw_section)
+
+    def draw_playing(self, game, alpha, now):
+        surf = self.screen.screen
+        world = game.world
+        px, py = world.prev_camera
+        cam_x = lerp(px, world.camera_x, alpha)
+        cam_y = lerp(py, world.camera_y, alpha)
+        penguin = world.penguin
+        dirty = self.dirty
+        batch = self.batch
+        culler = self.culler
+        view_w, view_h = surf.get_size()
+        culler.begin(cam_x, cam_y, view_w, view_h)
+
+        # INFINITE BACKGROUND (scrolls with camera)
+        self.background.draw(surf, cam_x, cam_y)
+        dirty.scrolled(self.background.offset, self.background.tile.get_size())
+        profiler.lap("draw.background")
+
+        # GROUND PICKUPS (shovel)
+        self.draw_pickups(game, "ground", cam_x, cam_y, now)
+
+        # SNOW PATCH PREVIEW (blob + falling flakes, world-anchored)
+        wr = world.pending_patch
+        if game.snowfall_active and wr and culler.visible("previews", wr.centerx, wr.centery, wr.w / 2, wr.h / 2):
+            pulse = 2.5 * (0.5 + 0.5 * math.sin(now * 0.01))
+            dirty.add(self.draw_world_preview_circle(wr.centerx, wr.centery, max(wr.w, wr.h) // 3, 55, cam_x, cam_y, pulse=pulse, batch=batch))
+        batch.flush(surf)
+        dirty.extend(game.preview_flakes.draw(surf, cam_x, cam_y, alpha, return_rects=dirty.enabled))
+
+        # patches + flakes (world-anchored)
+        patches = game.patches_in(*culler.bounds)
+        culler.count("patches", len(patches), len(game.snow_patches) - len(patches))
+        for p in patches:
+            dirty.add(p.draw(surf, cam_x, cam_y, batch))
+        batch.flush(surf)
+
+        flakes = game.patch_flakes
+        dirty.extend(flakes.draw(surf, cam_x, cam_y, alpha, return_rects=dirty.enabled))
+        culler.count("flakes", flakes.drawn + game.preview_flakes.drawn, flakes.culled + game.preview_flakes.culled)
+        profiler.lap("draw.patches")
+
+        # PLAYER
+        ppx, ppy = world.prev_penguin
+        penguin.x = lerp(ppx, penguin.world_x, alpha) - cam_x
+        penguin.y = lerp(ppy, penguin.world_y, alpha) - cam_y
+        dirty.add(penguin.draw(batch))
+        profiler.lap("draw.player")
+
+        # PICKUPS (fish, pebble; preview circles first)
+        self.draw_pickups(game, "sprites", cam_x, cam_y, now)
+
+        batch.flush(surf)
+        profiler.lap("draw.sprites")
+
+        # SNOWBALLS
+        snowballs = game.snowballs
+        dirty.extend(snowballs.draw(surf, cam_x, cam_y, alpha, return_rects=dirty.enabled))
+        culler.count("snowballs", snowballs.drawn, snowballs.culled)
+        profiler.lap("draw.snowballs")
+
+        # HUD pixels only change when a counter does (or something moves
+        # underneath, which is already dirty)
+        hud_rects = self.draw_hud(game)
+        hud_key = (world.score, world.fish_collected, world.shield_count)
+        if hud_key != self._hud_key:
+            # old rects too: a shorter counter leaves floor where digits were
+            dirty.extend(self._hud_rects)
+            dirty.extend(hud_rects)
+            self._hud_key = hud_key
+            self._hud_rects = hud_rects
+        profiler.lap("draw.hud")
+
+    def draw_hud(self, game):
+        """Returns the rects drawn."""
+        surf = self.screen.screen
+        world = game.world
+        hud_text = self.hud_text
+        batch = self.batch
+
+        # Score
+        rects = [hud_text.draw(surf, f"Score: {world.score}", SCORE_POS)]
+
+        # Fish icon + count
+        fish_rect = self.fish_icon.get_rect(midleft=(HUD_X, FISH_ROW_Y))
+        batch.add_region(self.fish_region, fish_rect)
+        fish_str = f"x {world.fish_collected}"
+        fish_txt_rect = hud_text.get_rect(fish_str, midleft=(fish_rect.right + 10, FISH_ROW_Y))
+        rects.append(fish_rect.union(hud_text.draw(surf, fish_str, fish_txt_rect.topleft)))
+
+        # Pebble shield HUD (smaller boxes)
+        EMPTY_BOX = 28  # smaller than before
+        rects.append(pygame.Rect(HUD_X, PEBBLE_ROW_Y - EMPTY_BOX // 2, 3 * EMPTY_BOX + 2 * PEBBLE_SPACING, EMPTY_BOX))
+        for i in range(3):
+            x = HUD_X + i * (EMPTY_BOX + PEBBLE_SPACING)
+            r = pygame.Rect(x, PEBBLE_ROW_Y - EMPTY_BOX // 2, EMPTY_BOX, EMPTY_BOX)
+
+            if i < world.shield_count:
+                batch.add_region(self.pebble_region, self.pebble_icon.get_rect(center=r.center))
+            else:
+                pygame.draw.rect(surf, (0, 0, 0), r, 2)
+        batch.flush(surf)
+        return rects
+
+    # -------------------------
+    # GAME OVER (attract mode + text)
+    # -------------------------
+    def draw_game_over(self, game, highscore, total_fish, alpha=1.0):
+        surf = self.screen.screen
+        world = game.world
+        attract = game.attract
+        go_penguin = attract.penguin
+        font = self.font
+        dirty = self.dirty
+        batch = self.batch
+        culler = self.culler
+        px, py = world.prev_camera
+        cam_x = lerp(px, world.camera_x, alpha)
+        cam_y = lerp(py, world.camera_y, alpha)
+        culler.begin(cam_x, cam_y, *surf.get_size())
+
+        # Draw looping background (scrolls a fixed step per tick)
+        bg_offset_x = attract.bg_offset_x + attract.BG_SCROLL * (1.0 - alpha)
+        self.background.draw(surf, -bg_offset_x, 0)
+        dirty.scrolled(self.background.offset, self.background.tile.get_size())
+
+        # Draw snowballs (they only move by vx per tick)
+        reach = SnowballField.DRAW_REACH
+        back = 1.0 - alpha
+        for sb in attract.snowballs:
+            x = sb.world_x - sb.vx * back
+            if culler.visible("snowballs", x, sb.world_y, reach, reach):
+                sb.x = x - cam_x
+                sb.y = sb.world_y - cam_y
+                dirty.add(sb.draw(batch))
+
+        # Draw penguin
+        ppx, ppy = attract.prev_penguin
+        go_penguin.x = lerp(ppx, go_penguin.world_x, alpha) - cam_x
+        go_penguin.y = lerp(ppy, go_penguin.world_y, alpha) - cam_y
+        dirty.add(go_penguin.draw(batch))
+        batch.flush(surf)
+
+        # UI
+        draw_centered_text(surf, "GAME OVER", self.big_font, (200, 0, 0), -140)
+        draw_centered_text(surf, f"Score: {world.score}", font, (0, 0, 0), -60)
+        draw_centered_text(surf, f"High Score: {highscore}", font, (0, 0, 0), -20)
+        draw_centered_text(surf, f"Total Fish: {total_fish}", font, (0, 100, 200), 40)
+        draw_centered_text(surf, "SPACE = Restart", font, (0, 0, 0), 120)
+        draw_centered_text(surf, "S = Skins    V = Volume", font, (0, 0, 0), 160)
+        draw_centered_text(surf, "ESC = Quit", font, (0, 0, 0), 200)
+        profiler.lap("draw.game_over")
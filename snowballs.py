@@ -0,0 +1,254 @@
+import numpy as np
+
+import sprites
+from atlas import atlas
+from spatial import SpatialHash
+from entities import (
+    SNOWBALL_IMAGE, SNOWBALL_SPIN_STEP, SNOWBALL_MIN_RADIUS, SNOWBALL_MAX_RADIUS,
+    roll_snowball_radius, roll_snowball_launch,
+)
+
+
+# -------------------------
+# Snowball field (struct of arrays)
+# -------------------------
+class SnowballField:
+    """
+    All PLAYING snowballs in contiguous NumPy arrays (world space).
+    Motion, penguin collision and off-camera culling run as array ops over
+    slots [0, high); only draw() walks snowballs one by one.
+    Dead slots go on a free list and are reused by spawn().
+
+    Slots are also kept in a SpatialHash (as points, re-linked only when a
+    snowball crosses into another cell) so circle queries around the
+    penguin / shovel only test nearby snowballs.
+    """
+
+    SHADOW_ALPHA = 100
+    SHADOW_OFFSET_Y = 22
+    INDEX_CELL_SIZE = 96
+    # farthest a sprite / shadow pixel reaches from its centre
+    DRAW_REACH = SNOWBALL_MAX_RADIUS * 2 + SHADOW_OFFSET_Y
+
+    def __init__(self, capacity=256):
+        self.capacity = 0
+        self.high = 0
+        self.count = 0
+        self.free = []
+        self.index = SpatialHash(self.INDEX_CELL_SIZE)
+        self.drawn = 0   # last draw(): blitted / skipped as off-view
+        self.culled = 0
+        self._allocate(capacity)
+
+        # per radius: atlas region + (half_w, half_h) of each rotation frame
+        self._tables = {}
+
+    def _allocate(self, capacity):
+        def grow(arr, dtype):
+            out = np.zeros(capacity, dtype=dtype)
+            if arr is not None:
+                out[:len(arr)] = arr
+            return out
+
+        old = self.capacity > 0
+        self.x = grow(self.x if old else None, np.float64)
+        self.y = grow(self.y if old else None, np.float64)
+        self.prev_x = grow(self.prev_x if old else None, np.float64)
+        self.prev_y = grow(self.prev_y if old else None, np.float64)
+        self.vx = grow(self.vx if old else None, np.float64)
+        self.vy = grow(self.vy if old else None, np.float64)
+        self.radius = grow(self.radius if old else None, np.int32)
+        self.angle = grow(self.angle if old else None, np.int32)
+        self.alive = grow(self.alive if old else None, np.bool_)
+        self.cell_x = grow(self.cell_x if old else None, np.int64)
+        self.cell_y = grow(self.cell_y if old else None, np.int64)
+        self.capacity = capacity
+
+    # --------------------------------------------------
+    # Spawning / removal
+    # --------------------------------------------------
+
+    def spawn(self, view_w, view_h, camera_x, camera_y, score):
+        """Launch one snowball from a screen edge (same rules as Snowball)."""
+        radius = roll_snowball_radius()
+        x, y, vx, vy = roll_snowball_launch(view_w, view_h, radius, score)
+        return self.add(x + camera_x, y + camera_y, vx, vy, radius)
+
+    def add(self, x, y, vx, vy, radius):
+        if self.free:
+            i = self.free.pop()
+        else:
+            if self.high == self.capacity:
+                self._allocate(self.capacity * 2)
+            i = self.high
+            self.high += 1
+
+        self.x[i] = self.prev_x[i] = x
+        self.y[i] = self.prev_y[i] = y
+        self.vx[i] = vx
+        self.vy[i] = vy
+        self.radius[i] = radius
+        self.angle[i] = 0
+        self.alive[i] = True
+        self.count += 1
+
+        cs = self.INDEX_CELL_SIZE
+        self.cell_x[i] = np.floor(x / cs)
+        self.cell_y[i] = np.floor(y / cs)
+        self.index.insert(i, x, y)
+        return i
+
+    def _release(self, mask):
+        idx = np.flatnonzero(mask)
+        if len(idx) == 0:
+            return 0
+        self.alive[idx] = False
+        self.count -= len(idx)
+        if self.count == 0:
+            self.clear()
+        else:
+            released = idx.tolist()
+            for i in released:
+                self.index.remove(i)
+            self.free.extend(released)
+        return len(idx)
+
+    def clear(self):
+        self.alive[:self.high] = False
+        self.high = 0
+        self.count = 0
+        self.free.clear()
+        self.index.clear()
+
+    # --------------------------------------------------
+    # Batched simulation
+    # --------------------------------------------------
+
+    def update(self):
+        """One simulation tick. Previous positions are kept for draw()."""
+        n = self.high
+        self.prev_x[:n] = self.x[:n]
+        self.prev_y[:n] = self.y[:n]
+        self.x[:n] += self.vx[:n]
+        self.y[:n] += self.vy[:n]
+        self.angle[:n] += SNOWBALL_SPIN_STEP
+        self.angle[:n] %= 360
+        self._reindex()
+
+    def _reindex(self):
+        """Re-link only the snowballs that crossed a cell boundary."""
+        n = self.high
+        cs = self.INDEX_CELL_SIZE
+        cx = np.floor(self.x[:n] / cs).astype(np.int64)
+        cy = np.floor(self.y[:n] / cs).astype(np.int64)
+        moved = self.alive[:n] & ((cx != self.cell_x[:n]) | (cy != self.cell_y[:n]))
+        for i in np.flatnonzero(moved).tolist():
+            self.index.move(i, self.x[i], self.y[i])
+        self.cell_x[:n] = cx
+        self.cell_y[:n] = cy
+
+    def _near(self, cx, cy, r):
+        """Slots that may lie within r of (cx, cy), from the spatial hash."""
+        reach = r + SNOWBALL_MAX_RADIUS
+        keys = self.index.candidates(cx - reach, cy - reach, cx + reach, cy + reach)
+        return np.fromiter(keys, dtype=np.int64, count=len(keys))
+
+    def collides_circle(self, cx, cy, r):
+        """True if any live snowball overlaps the circle."""
+        idx = self._near(cx, cy, r)
+        if len(idx) == 0:
+            return False
+        dx = self.x[idx] - cx
+        dy = self.y[idx] - cy
+        reach = self.radius[idx] + r
+        return bool((dx * dx + dy * dy < reach * reach).any())
+
+    def remove_within(self, cx, cy, r):
+        """Remove snowballs whose centre is within r (shovel). Returns count."""
+        idx = self._near(cx, cy, r)
+        if len(idx) == 0:
+            return 0
+        dx = self.x[idx] - cx
+        dy = self.y[idx] - cy
+        mask = np.zeros(self.high, dtype=np.bool_)
+        mask[idx[dx * dx + dy * dy <= r * r]] = True
+        return self._release(mask)
+
+    def cull(self, left, top, right, bottom):
+        """Remove snowballs whose centre is outside the rect. Returns count."""
+        n = self.high
+        x = self.x[:n]
+        y = self.y[:n]
+        outside = (x < left) | (x > right) | (y < top) | (y > bottom)
+        return self._release(self.alive[:n] & outside)
+
+    # --------------------------------------------------
+    # Draw (per sprite)
+    # --------------------------------------------------
+
+    def _table(self, radius):
+        table = self._tables.get(radius)
+        if table is None:
+            size = (radius * 2, radius * 2)
+            frames = sprites.load_rotations(SNOWBALL_IMAGE, size, step=SNOWBALL_SPIN_STEP)
+            table = [
+                (page, area, f.get_width() // 2, f.get_height() // 2)
+                for f, (page, area) in zip(frames, atlas.frames(frames))
+            ]
+            self._tables[radius] = table
+        return table
+
+    def draw(self, surface, camera_x, camera_y, alpha=1.0, return_rects=False):
+        """
+        alpha interpolates between the previous and the current tick.
+        Snowballs outside the surface are skipped (see drawn / culled).
+        With return_rects, returns the screen rect of every blit.
+        """
+        idx = np.flatnonzero(self.alive[:self.high])
+        self.drawn = self.culled = 0
+        if len(idx) == 0:
+            return []
+
+        x = self.x[idx]
+        y = self.y[idx]
+        if alpha < 1.0:
+            px = self.prev_x[idx]
+            py = self.prev_y[idx]
+            x = px + (x - px) * alpha
+            y = py + (y - py) * alpha
+
+        # view culling: live snowballs outside the surface cost no blit
+        sx = (x - camera_x).astype(np.int64)
+        sy = (y - camera_y).astype(np.int64)
+        w, h = surface.get_size()
+        reach = self.DRAW_REACH
+        shown = (sx > -reach) & (sx < w + reach) & (sy > -reach) & (sy < h + reach)
+        self.drawn = int(shown.sum())
+        self.culled = len(idx) - self.drawn
+        if self.culled:
+            idx = idx[shown]
+            sx = sx[shown]
+            sy = sy[shown]
+
+        sx = sx.tolist()
+        sy = sy.tolist()
+        radii = self.radius[idx].tolist()
+        frames = (self.angle[idx] // SNOWBALL_SPIN_STEP).tolist()
+
+        shadows = {}
+        blits = []
+        for x, y, r, f in zip(sx, sy, radii, frames):
+            shadow = shadows.get(r)
+            if shadow is None:
+                shadow = shadows[r] = sprites.get_shadow(r * 2, r, self.SHADOW_ALPHA)
+            blits.append((shadow, (x - r, y + self.SHADOW_OFFSET_Y - r // 2)))
+
+            page, area, hw, hh = self._table(r)[f]
+            blits.append((page, (x - hw, y - hh), area))
+
+        return surface.blits(blits, return_rects)
+
+    def warm_up(self):
+        """Build every rotation table up front (avoids a hitch on first spawn)."""
+        for r in range(SNOWBALL_MIN_RADIUS, SNOWBALL_MAX_RADIUS + 1):
+            self._table(r)
@@ -0,0 +1,142 @@
+import math
+
+
+# -------------------------
+# Uniform-grid spatial hash
+# -------------------------
+class SpatialHash:
+    """
+    World-space uniform grid. Each item is a circle (x, y, radius) or a rect,
+    stored in every cell its bounding box touches; keys can be any hashable.
+    Queries only look at the cells overlapping the query shape, so their
+    cost follows local density instead of the total item count.
+    """
+
+    def __init__(self, cell_size=128):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.items = {}  # key -> (x, y, radius, cell range)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, key):
+        return key in self.items
+
+    def _range(self, x, y, radius):
+        cs = self.cell_size
+        return (
+            math.floor((x - radius) / cs),
+            math.floor((y - radius) / cs),
+            math.floor((x + radius) / cs),
+            math.floor((y + radius) / cs),
+        )
+
+    def _link(self, key, cell_range):
+        x0, y0, x1, y1 = cell_range
+        cells = self.cells
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    bucket = cells[(cx, cy)] = set()
+                bucket.add(key)
+
+    def _unlink(self, key, cell_range):
+        x0, y0, x1, y1 = cell_range
+        cells = self.cells
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is not None:
+                    bucket.discard(key)
+                    if not bucket:
+                        del cells[(cx, cy)]
+
+    # --------------------------------------------------
+    # Mutation
+    # --------------------------------------------------
+
+    def insert(self, key, x, y, radius=0.0):
+        if key in self.items:
+            self.move(key, x, y, radius)
+            return
+        cell_range = self._range(x, y, radius)
+        self.items[key] = (x, y, radius, cell_range)
+        self._link(key, cell_range)
+
+    def insert_rect(self, key, rect):
+        """
+        Store an axis-aligned world rect (pygame.Rect). Linked to exactly the
+        cells it overlaps; query_circle() treats it as its bounding circle.
+        Rect items don't move(): remove() and insert again.
+        """
+        self.remove(key)
+        cs = self.cell_size
+        cell_range = (
+            math.floor(rect.left / cs),
+            math.floor(rect.top / cs),
+            math.floor(rect.right / cs),
+            math.floor(rect.bottom / cs),
+        )
+        radius = math.hypot(rect.w, rect.h) / 2
+        self.items[key] = (rect.centerx, rect.centery, radius, cell_range)
+        self._link(key, cell_range)
+
+    def move(self, key, x, y, radius=None):
+        _, _, old_radius, old_range = self.items[key]
+        if radius is None:
+            radius = old_radius
+        cell_range = self._range(x, y, radius)
+        if cell_range != old_range:
+            self._unlink(key, old_range)
+            self._link(key, cell_range)
+        self.items[key] = (x, y, radius, cell_range)
+
+    def remove(self, key):
+        item = self.items.pop(key, None)
+        if item is not None:
+            self._unlink(key, item[3])
+
+    def clear(self):
+        self.cells.clear()
+        self.items.clear()
+
+    # --------------------------------------------------
+    # Queries
+    # --------------------------------------------------
+
+    def candidates(self, x0, y0, x1, y1):
+        """Keys stored in any cell overlapping the world rect (broad phase)."""
+        cs = self.cell_size
+        cx0, cy0 = math.floor(x0 / cs), math.floor(y0 / cs)
+        cx1, cy1 = math.floor(x1 / cs), math.floor(y1 / cs)
+        cells = self.cells
+
+        found = set()
+        if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) > len(cells):
+            # query covers more cells than exist: walk the occupied ones
+            for (cx, cy), bucket in cells.items():
+                if cx0 <= cx <= cx1 and cy0 <= cy <= cy1:
+                    found |= bucket
+            return found
+
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    found |= bucket
+        return found
+
+    def query_circle(self, x, y, radius):
+        """Keys whose circle overlaps the query circle."""
+        items = self.items
+        out = []
+        for key in self.candidates(x - radius, y - radius, x + radius, y + radius):
+            ix, iy, ir, _ = items[key]
+            dx = ix - x
+            dy = iy - y
+            reach = ir + radius
+            if dx * dx + dy * dy < reach * reach:
+                out.append(key)
+        return out
@@ -0,0 +1,100 @@
+from collections import namedtuple
+
+import numpy as np
+import pygame
+
+import sprites
+
+
+# ===============================
+# SPRITE METRICS
+# ===============================
+# Per-frame measurements of a sprite sheet, computed for all frames at once
+# from their stacked alpha channels. Memoized by sheet path + slicing/scale
+# (+ alpha threshold), like the frame lists in sprites.py.
+
+# feet_y:          lowest opaque row (0 if the frame is empty)
+# bbox:            pygame.Rect around the opaque pixels (empty Rect if none)
+# center_of_mass:  (x, y) mean of the opaque pixels (frame centre if none)
+# opaque:          number of opaque pixels
+# A pixel is opaque when its alpha is above the threshold.
+FrameMetrics = namedtuple("FrameMetrics", "feet_y bbox center_of_mass opaque")
+
+_metrics = {}
+
+
+def measure_frames(frames, threshold=0) -> list:
+    """Metrics for equally sized surfaces, in one NumPy pass."""
+    if not frames:
+        return []
+
+    width, height = frames[0].get_size()
+    alphas = np.empty((len(frames), width, height), dtype=np.uint8)
+    for i, frame in enumerate(frames):
+        pixels = pygame.surfarray.pixels_alpha(frame)
+        alphas[i] = pixels
+        del pixels  # unlock surface
+
+    mask = alphas > threshold              # (n, x, y)
+    opaque = mask.sum(axis=(1, 2))
+    rows = mask.any(axis=1)                # (n, y)
+    cols = mask.any(axis=2)                # (n, x)
+
+    top = rows.argmax(axis=1)
+    bottom = height - 1 - rows[:, ::-1].argmax(axis=1)
+    left = cols.argmax(axis=1)
+    right = width - 1 - cols[:, ::-1].argmax(axis=1)
+
+    xs = np.arange(width)
+    ys = np.arange(height)
+    sum_x = (mask.sum(axis=2) * xs).sum(axis=1)
+    sum_y = (mask.sum(axis=1) * ys).sum(axis=1)
+
+    out = []
+    for i in range(len(frames)):
+        count = int(opaque[i])
+        if count == 0:
+            out.append(FrameMetrics(0, pygame.Rect(0, 0, 0, 0), (width / 2.0, height / 2.0), 0))
+            continue
+        bbox = pygame.Rect(int(left[i]), int(top[i]),
+                           int(right[i] - left[i]) + 1, int(bottom[i] - top[i]) + 1)
+        com = (float(sum_x[i]) / count, float(sum_y[i]) / count)
+        out.append(FrameMetrics(int(bottom[i]), bbox, com, count))
+    return out
+
+
+def sheet_metrics(relative_path: str, cols: int, rows: int = 1, scale: float = 1.0,
+                  frame_size=None, threshold=0) -> list:
+    """
+    Metrics for every frame of sprites.load_frames(...) with the same
+    arguments (same order), from the bake manifest when it is fresh.
+    Returns a shared list.
+    """
+    key = (relative_path, cols, rows, scale, frame_size, threshold)
+    metrics = _metrics.get(key)
+    if metrics is None:
+        entry = sprites.baked_entry(relative_path, cols, rows, scale, frame_size)
+        baked = entry.get("metrics", {}).get(str(threshold)) if entry else None
+        if baked is not None:
+            metrics = decode_metrics(baked)
+        else:
+            frames = sprites.load_frames(relative_path, cols, rows, scale=scale, frame_size=frame_size)
+            metrics = measure_frames(frames, threshold)
+        _metrics[key] = metrics
+    return metrics
+
+
+def encode_metrics(metrics) -> list:
+    """JSON-friendly form (for the bake manifest)."""
+    return [[m.feet_y, list(m.bbox), list(m.center_of_mass), m.opaque] for m in metrics]
+
+
+def decode_metrics(raw) -> list:
+    return [
+        FrameMetrics(feet_y, pygame.Rect(bbox), tuple(com), opaque)
+        for feet_y, bbox, com, opaque in raw
+    ]
+
+
+def clear_cache():
+    _metrics.clear()
@@ -0,0 +1,334 @@
+import hashlib
+import json
+import queue
+import threading
+from collections import OrderedDict
+
+import pygame
+from utils import resource_path
+
+
+# ===============================
+# SPRITE CACHE
+# ===============================
+# Every image is decoded once per process and every (sheet, grid, scale)
+# slicing is done once. Entities get shared frame lists back, so they must
+# treat them as read-only.
+
+_images = {}
+_frames = {}
+_scaled = {}
+_rotations = {}
+
+_stats = {"hits": 0, "misses": 0, "baked": 0, "stale": 0}
+
+
+def _hit():
+    _stats["hits"] += 1
+
+
+def _miss():
+    _stats["misses"] += 1
+
+
+def load_image(relative_path: str, alpha: bool = True) -> pygame.Surface:
+    """
+    Load (and convert) an image from the assets folder once.
+    Returns the shared surface.
+    """
+    key = (relative_path, alpha)
+    img = _images.get(key)
+    if img is not None:
+        _hit()
+        return img
+
+    _miss()
+    img = pygame.image.load(resource_path(relative_path))
+    img = img.convert_alpha() if alpha else img.convert()
+    _images[key] = img
+    return img
+
+
+def load_frames(relative_path: str, cols: int, rows: int = 1, scale: float = 1.0,
+                frame_size=None) -> list:
+    """
+    Slice a sprite sheet into cols x rows frames (row-major) and scale them.
+    frame_size defaults to sheet_size // grid.
+    The same list object is returned for the same arguments.
+    """
+    key = (relative_path, cols, rows, scale, frame_size)
+    frames = _frames.get(key)
+    if frames is not None:
+        _hit()
+        return frames
+
+    _miss()
+    entry = baked_entry(relative_path, cols, rows, scale, frame_size)
+    if entry is not None:
+        # pre-scaled by bake.py: just index the baked sheet
+        sheet = load_image(f"{BAKED_DIR}/{entry['image']}")
+        frames = [sheet.subsurface(pygame.Rect(r)) for r in entry["frames"]]
+        _frames[key] = frames
+        return frames
+
+    sheet = load_image(relative_path)
+    if frame_size is None:
+        fw = sheet.get_width() // cols
+        fh = sheet.get_height() // rows
+    else:
+        fw, fh = frame_size
+
+    out_size = (int(fw * scale), int(fh * scale))
+    frames = []
+    for row in range(rows):
+        for col in range(cols):
+            frame = sheet.subsurface(pygame.Rect(col * fw, row * fh, fw, fh))
+            if out_size != (fw, fh):
+                frame = pygame.transform.scale(frame, out_size)
+            frames.append(frame)
+
+    _frames[key] = frames
+    return frames
+
+
+def load_scaled(relative_path: str, size, smooth: bool = False) -> pygame.Surface:
+    """
+    Whole image scaled to an exact size, cached per (path, size, smooth).
+    """
+    size = (int(size[0]), int(size[1]))
+    key = (relative_path, size, smooth)
+    img = _scaled.get(key)
+    if img is not None:
+        _hit()
+        return img
+
+    _miss()
+    src = load_image(relative_path)
+    if smooth:
+        img = pygame.transform.smoothscale(src, size)
+    else:
+        img = pygame.transform.scale(src, size)
+    _scaled[key] = img
+    return img
+
+
+def load_rotations(relative_path: str, size, step: int = 5, smooth: bool = True) -> list:
+    """
+    Pre-rotated copies of a scaled image, one per `step` degrees.
+    Index with angle // step (angles must be multiples of step).
+    """
+    size = (int(size[0]), int(size[1]))
+    key = (relative_path, size, step, smooth)
+    table = _rotations.get(key)
+    if table is not None:
+        _hit()
+        return table
+
+    _miss()
+    base = load_scaled(relative_path, size, smooth=smooth)
+    table = [pygame.transform.rotate(base, angle) for angle in range(0, 360, step)]
+    _rotations[key] = table
+    return table
+
+
+# ===============================
+# BACKGROUND PREFETCH
+# ===============================
+# The caches above are main-thread only (and convert_alpha() needs the
+# display). A prefetch thread only decodes image files; the main loop
+# calls drain_prefetched() once per frame to convert and cache them.
+
+_decoded = queue.Queue()
+_prefetching = set()
+
+
+def prefetch_images(relative_paths):
+    """Decode images that aren't cached yet on a daemon thread (main thread)."""
+    paths = [
+        p for p in relative_paths
+        if (p, True) not in _images and p not in _prefetching
+    ]
+    if not paths:
+        return
+    _prefetching.update(paths)
+
+    def decode():
+        for path in paths:
+            try:
+                img = pygame.image.load(resource_path(path))
+            except (OSError, pygame.error):
+                img = None  # load_image() will retry (and raise) on the main thread
+            _decoded.put((path, img))
+
+    threading.Thread(target=decode, name="sprite-prefetch", daemon=True).start()
+
+
+def drain_prefetched():
+    """Convert + cache what the prefetch thread decoded so far (main thread)."""
+    while True:
+        try:
+            path, img = _decoded.get_nowait()
+        except queue.Empty:
+            return
+        _prefetching.discard(path)
+        key = (path, True)
+        if img is not None and key not in _images:
+            _images[key] = img.convert_alpha()
+
+
+def sheet_image_path(relative_path: str, cols: int, rows: int = 1, scale: float = 1.0,
+                     frame_size=None) -> str:
+    """The image load_frames() reads for these arguments (baked sheet or source)."""
+    entry = baked_entry(relative_path, cols, rows, scale, frame_size)
+    return f"{BAKED_DIR}/{entry['image']}" if entry is not None else relative_path
+
+
+# ===============================
+# BAKED ASSETS
+# ===============================
+# bake.py writes pre-scaled frame sheets and their metrics to BAKED_DIR,
+# indexed by a manifest. An entry is only used while the sha256 of its
+# source image still matches; otherwise we fall back to live slicing /
+# scaling / measuring.
+
+BAKED_DIR = "assets/baked"
+MANIFEST_FILE = "manifest.json"
+MANIFEST_VERSION = 1
+
+USE_BAKED = True  # bake.py turns this off to process the sources live
+
+_manifest = None
+_source_hashes = {}
+_fresh = {}  # bake_key -> source hash still matches
+
+
+def bake_key(relative_path: str, cols: int, rows: int = 1, scale: float = 1.0,
+             frame_size=None) -> str:
+    """Manifest key for one load_frames() call."""
+    return json.dumps([
+        relative_path, cols, rows, float(scale),
+        list(frame_size) if frame_size is not None else None,
+    ])
+
+
+def source_hash(relative_path: str) -> str:
+    digest = _source_hashes.get(relative_path)
+    if digest is None:
+        with open(resource_path(relative_path), "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        _source_hashes[relative_path] = digest
+    return digest
+
+
+def load_manifest() -> dict:
+    """Baked sheets by bake_key; {} when there is no (readable) bake."""
+    global _manifest
+    if _manifest is None:
+        try:
+            with open(resource_path(f"{BAKED_DIR}/{MANIFEST_FILE}"), "r", encoding="utf-8") as f:
+                raw = json.load(f)
+        except (OSError, ValueError):
+            raw = None
+        if not isinstance(raw, dict) or raw.get("version") != MANIFEST_VERSION:
+            raw = {"sheets": {}}
+        _manifest = raw.get("sheets", {})
+    return _manifest
+
+
+def baked_entry(relative_path: str, cols: int, rows: int = 1, scale: float = 1.0,
+                frame_size=None):
+    """Manifest entry for these load_frames() arguments, or None if absent / stale."""
+    if not USE_BAKED:
+        return None
+    key = bake_key(relative_path, cols, rows, scale, frame_size)
+    entry = load_manifest().get(key)
+    if entry is None:
+        return None
+
+    fresh = _fresh.get(key)
+    if fresh is None:
+        try:
+            fresh = entry.get("sha256") == source_hash(relative_path)
+        except OSError:
+            fresh = False
+        _fresh[key] = fresh
+        _stats["baked" if fresh else "stale"] += 1
+    return entry if fresh else None
+
+
+# ===============================
+# SHADOW CACHE
+# ===============================
+# Drop shadows are plain black ellipses, keyed by (w, h, alpha); pickup /
+# patch preview circles share the same LRU, keyed by ("circle", r, alpha).
+# Bounded LRU: window resizes / skin swaps / pulsing radii produce new
+# sizes over time.
+
+SHADOW_CACHE_SIZE = 64
+
+_shadows = OrderedDict()
+_shadow_stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+
+def _cached_shape(key, size, draw):
+    surf = _shadows.get(key)
+    if surf is not None:
+        _shadows.move_to_end(key)
+        _shadow_stats["hits"] += 1
+        return surf
+
+    _shadow_stats["misses"] += 1
+    surf = pygame.Surface(size, pygame.SRCALPHA)
+    draw(surf)
+    _shadows[key] = surf
+
+    if len(_shadows) > SHADOW_CACHE_SIZE:
+        _shadows.popitem(last=False)
+        _shadow_stats["evictions"] += 1
+    return surf
+
+
+def get_shadow(width: int, height: int, alpha: int) -> pygame.Surface:
+    """Shared SRCALPHA ellipse surface. Do not draw onto it."""
+    key = (max(1, int(width)), max(1, int(height)), int(alpha))
+    return _cached_shape(key, key[:2], lambda surf: pygame.draw.ellipse(surf, (0, 0, 0, key[2]), surf.get_rect()))
+
+
+def get_circle(radius: int, alpha: int) -> pygame.Surface:
+    """Shared SRCALPHA black circle, (2 * radius) px square. Do not draw onto it."""
+    r = max(1, int(radius))
+    key = ("circle", r, int(alpha))
+    return _cached_shape(key, (r * 2, r * 2), lambda surf: pygame.draw.circle(surf, (0, 0, 0, key[2]), (r, r), r))
+
+
+def cache_stats() -> dict:
+    """
+    Hit/miss counters plus entry counts.
+    After warm-up, misses should stop growing while spawning.
+    """
+    return {
+        "hits": _stats["hits"],
+        "misses": _stats["misses"],
+        "baked_sheets": _stats["baked"],
+        "stale_sheets": _stats["stale"],
+        "images": len(_images),
+        "frame_sets": len(_frames),
+        "scaled": len(_scaled),
+        "rotation_tables": len(_rotations),
+        "shadows": len(_shadows),
+        "shadow_hits": _shadow_stats["hits"],
+        "shadow_misses": _shadow_stats["misses"],
+        "shadow_evictions": _shadow_stats["evictions"],
+    }
+
+
+def clear_cache():
+    """Drop everything (e.g. after the display mode / pixel format changes)."""
+    _images.clear()
+    _frames.clear()
+    _scaled.clear()
+    _rotations.clear()
+    _shadows.clear()
+    for stats in (_stats, _shadow_stats):
+        for k in stats:
+            stats[k] = 0
@@ -0,0 +1,209 @@
+import json
+import os
+
+import pygame
+
+import sprites
+import utils
+from game import SimClock
+from profiler import FrameProfiler
+
+
+# -------------------------
+# Save data (utils.py)
+# -------------------------
+def test_legacy_txt_saves_migrate_to_json(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    saves = tmp_path / "saves"
+    saves.mkdir()
+    (saves / "fish.txt").write_text("42\n")
+    (saves / "highscore.txt").write_text(" 17 ")
+    (saves / "owned_skins.txt").write_text("default\nlucky\n\n")
+
+    data = utils.read_save_file(utils.get_save_path(utils.SAVE_FILE))
+
+    assert data["fish"] == 42
+    assert data["highscore"] == 17
+    assert data["owned_skins"] == ["default", "lucky"]
+    assert data["version"] == utils.SAVE_VERSION
+
+
+def test_no_saves_at_all_gives_defaults(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    data = utils.read_save_file(utils.get_save_path(utils.SAVE_FILE))
+    assert data == utils.default_save_data()
+
+
+def test_validate_save_data_rejects_bad_types():
+    data = utils.validate_save_data({
+        "fish": True,
+        "highscore": "3.0",
+        "owned_skins": "default",
+        "settings": ["not", "a", "dict"],
+        "unknown": 1,
+    })
+
+    assert data["fish"] == 0
+    assert data["highscore"] == 3
+    assert data["owned_skins"] == ["default"]
+    assert data["settings"] == {}
+    assert "unknown" not in data
+
+
+def test_validate_save_data_int_fields():
+    for value, expected in ((5, 5), ("12", 12), (" 7\n", 7), (4.0, 4), (2.5, 0), ("abc", 0), (None, 0)):
+        assert utils.validate_save_data({"fish": value})["fish"] == expected, value
+
+
+def test_validate_save_data_skin_list():
+    data = utils.validate_save_data({"owned_skins": ["lucky", 3, "", None, "cool"]})
+    assert data["owned_skins"] == ["default", "lucky", "cool"]
+    assert utils.validate_save_data("garbage") == utils.default_save_data()
+
+
+def test_unreadable_save_is_moved_aside(tmp_path):
+    path = tmp_path / "save.json"
+    path.write_text("{not json")
+
+    data = utils.read_save_file(str(path))
+
+    assert data == utils.default_save_data()
+    assert not path.exists()
+    assert (tmp_path / "save.json.bad").read_text() == "{not json"
+
+
+def test_save_file_round_trip(tmp_path):
+    path = tmp_path / "save.json"
+    data = utils.default_save_data()
+    data["fish"] = 9
+    path.write_text(utils.encode_save_data(data))
+
+    assert utils.read_save_file(str(path)) == data
+    assert json.loads(path.read_text())["fish"] == 9
+    assert os.listdir(tmp_path) == ["save.json"]
+
+
+def test_failed_save_write_stays_pending(tmp_path, monkeypatch):
+    store = utils.SaveStore()
+    store._path = str(tmp_path / "save.json")
+    store.set("fish", 5)
+
+    def fail(path, text):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(utils, "_atomic_write", fail)
+    store.flush()
+    assert not os.path.exists(store._path)
+
+    monkeypatch.undo()
+    store.flush()
+    assert json.loads((tmp_path / "save.json").read_text())["fish"] == 5
+
+
+# -------------------------
+# Fixed-step clock (game.py)
+# -------------------------
+def test_sim_clock_runs_whole_ticks_and_keeps_the_rest():
+    clock = SimClock(hz=50, max_steps=5)  # 20 ms ticks
+    assert clock.advance(10) == 0
+    assert clock.advance(15) == 1
+    assert clock.accumulator == 5
+    assert clock.alpha == 0.25
+
+
+def test_sim_clock_clamps_steps_and_drops_the_backlog():
+    clock = SimClock(hz=50, max_steps=5)
+    assert clock.advance(1000 + 7) == 5
+    assert clock.accumulator == 7  # the other 45 ticks are skipped
+    assert clock.advance(13) == 1
+    assert clock.accumulator == 0
+
+
+def test_sim_clock_reset():
+    clock = SimClock(hz=50, max_steps=5)
+    clock.advance(35)
+    clock.reset()
+    assert clock.accumulator == 0 and clock.alpha == 0
+
+
+# -------------------------
+# Frame profiler (profiler.py)
+# -------------------------
+def test_profiler_switched_on_mid_frame_starts_with_the_next_frame(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    prof = FrameProfiler()
+
+    # F3 / F4 arrive in the event loop, after begin() already returned
+    prof.begin()
+    prof.toggle_overlay()
+    csv_path = prof.start_csv("profile.csv")
+    prof.lap("events")
+    prof.end()
+    assert len(prof.totals) == 0 and len(prof.history) == 0
+
+    prof.begin()
+    prof.lap("events")
+    prof.end()
+    prof.stop_csv()
+
+    assert len(prof.totals) == 1
+    assert 0.0 <= prof.totals[0] < 1000.0
+    assert 0.0 <= prof.averages()["events"] < 1000.0
+
+    with open(csv_path) as f:
+        rows = f.read().splitlines()
+    assert len(rows) == 2  # header + the one fully timed frame
+    assert 0.0 <= float(rows[1].split(",")[1]) < 1000.0
+
+
+# -------------------------
+# Baked assets (sprites.py)
+# -------------------------
+def _bake_one(tmp_path, monkeypatch):
+    """A source sheet plus a manifest that matches it; returns the source path."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sprites, "_manifest", None)
+    monkeypatch.setattr(sprites, "_fresh", {})
+    monkeypatch.setattr(sprites, "_source_hashes", {})
+
+    source = "sheet.png"
+    surface = pygame.Surface((4, 2))
+    surface.fill((10, 20, 30))
+    pygame.image.save(surface, source)
+
+    baked = tmp_path / sprites.BAKED_DIR
+    baked.mkdir(parents=True)
+    entry = {"image": "sheet.png", "sha256": sprites.source_hash(source), "frames": [[0, 0, 2, 2], [2, 0, 2, 2]]}
+    manifest = {"version": sprites.MANIFEST_VERSION, "sheets": {sprites.bake_key(source, 2): entry}}
+    (baked / sprites.MANIFEST_FILE).write_text(json.dumps(manifest))
+    sprites._source_hashes.clear()
+    return source
+
+
+def test_baked_entry_used_while_source_matches(tmp_path, monkeypatch):
+    source = _bake_one(tmp_path, monkeypatch)
+
+    entry = sprites.baked_entry(source, 2)
+    assert entry is not None
+    assert entry["frames"] == [[0, 0, 2, 2], [2, 0, 2, 2]]
+    assert sprites.baked_entry(source, 3) is None  # other slicing: not baked
+
+
+def test_baked_entry_stale_after_source_changes(tmp_path, monkeypatch):
+    source = _bake_one(tmp_path, monkeypatch)
+
+    surface = pygame.Surface((4, 2))
+    surface.fill((200, 0, 0))
+    pygame.image.save(surface, source)
+
+    assert sprites.baked_entry(source, 2) is None
+
+
+def test_baked_entry_ignores_other_manifest_versions(tmp_path, monkeypatch):
+    source = _bake_one(tmp_path, monkeypatch)
+    path = tmp_path / sprites.BAKED_DIR / sprites.MANIFEST_FILE
+    manifest = json.loads(path.read_text())
+    manifest["version"] = sprites.MANIFEST_VERSION + 1
+    path.write_text(json.dumps(manifest))
+
+    assert sprites.baked_entry(source, 2) is None
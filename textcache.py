@@ -0,0 +1,127 @@
+from collections import OrderedDict
+
+import pygame
+
+
+# ===============================
+# TEXT SURFACE CACHE
+# ===============================
+
+class TextCache:
+    """
+    Bounded LRU of rendered text surfaces keyed by
+    (font, text, color, antialias). Returned surfaces are shared: never
+    draw onto them.
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._surfaces = OrderedDict()
+        self._atlases = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def render(self, font, text, color, antialias=True) -> pygame.Surface:
+        key = (font, text, tuple(color), antialias)
+        surf = self._surfaces.get(key)
+        if surf is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surf
+
+        self.misses += 1
+        surf = font.render(text, antialias, color)
+        self._surfaces[key] = surf
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)
+            self.evictions += 1
+        return surf
+
+    def glyph_atlas(self, font, color, antialias=True):
+        """Per-character renderer for strings that change every few frames."""
+        key = (font, tuple(color), antialias)
+        atlas = self._atlases.get(key)
+        if atlas is None:
+            atlas = GlyphAtlas(font, color, antialias)
+            self._atlases[key] = atlas
+        return atlas
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        atlas_hits = sum(a.hits for a in self._atlases.values())
+        atlas_misses = sum(a.misses for a in self._atlases.values())
+        return {
+            "entries": len(self._surfaces),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "atlases": len(self._atlases),
+            "glyph_hits": atlas_hits,
+            "glyph_misses": atlas_misses,
+        }
+
+    def clear(self):
+        self._surfaces.clear()
+        self._atlases.clear()
+
+
+# ===============================
+# GLYPH ATLAS
+# ===============================
+
+class GlyphAtlas:
+    """
+    Each character is rendered once; strings are drawn glyph by glyph.
+    Meant for scores/counters, where caching whole strings would just churn
+    the LRU. Only suitable for fonts without kerning (our pixel font).
+    """
+
+    def __init__(self, font, color, antialias=True):
+        self.font = font
+        self.color = color
+        self.antialias = antialias
+        self.height = font.get_height()
+        self._glyphs = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _glyph(self, ch):
+        glyph = self._glyphs.get(ch)
+        if glyph is None:
+            self.misses += 1
+            glyph = self.font.render(ch, self.antialias, self.color)
+            self._glyphs[ch] = glyph
+        else:
+            self.hits += 1
+        return glyph
+
+    def size(self, text):
+        return sum(self._glyph(ch).get_width() for ch in text), self.height
+
+    def get_rect(self, text, **kwargs) -> pygame.Rect:
+        rect = pygame.Rect((0, 0), self.size(text))
+        for attr, value in kwargs.items():
+            setattr(rect, attr, value)
+        return rect
+
+    def draw(self, target, text, pos) -> pygame.Rect:
+        """Blit text with its top-left at pos; returns the covered rect."""
+        x, y = pos
+        blits = []
+        offset = 0
+        for ch in text:
+            glyph = self._glyph(ch)
+            blits.append((glyph, (x + offset, y)))
+            offset += glyph.get_width()
+        target.blits(blits, False)
+        return pygame.Rect(x, y, offset, self.height)
+
+
+# shared instance used by the game
+text_cache = TextCache()
+
+
+def render_text(font, text, color, antialias=True) -> pygame.Surface:
+    return text_cache.render(font, text, color, antialias)
@@ -1,5 +1,10 @@
 import os
 import sys
+import copy
+import json
+import atexit
+import logging
+import threading
 import pygame
 
 
@@ -55,46 +60,245 @@ def circle_rect_overlap(cx, cy, cr, rect: pygame.Rect) -> bool:
     return (dx * dx + dy * dy) <= (cr * cr)
 
 
-def calculate_foot_ratio(surface: pygame.Surface) -> float:
-    """
-    Returns a float (0.0–1.0) indicating where the 'feet' are vertically
-    inside the sprite, based on the lowest non-transparent pixel.
-    """
-    width, height = surface.get_size()
-    pixel_array = pygame.surfarray.pixels_alpha(surface)
-
-    lowest_y = 0
-    for y in range(height - 1, -1, -1):
-        if pixel_array[:, y].max() > 0:
-            lowest_y = y
-            break
-
-    del pixel_array  # unlock surface
-    return lowest_y / height
-
-
 # ===============================
-# SAVE FILE HELPERS
+# SAVE STORE
 # ===============================
-
-def _load_int(filename: str, default: int = 0) -> int:
-    path = get_save_path(filename)
-    if not os.path.exists(path):
-        with open(path, "w") as f:
-            f.write(str(default))
-        return default
-
+# All player data lives in one versioned JSON file, read once into memory.
+# Writes only mark the store dirty; a background writer coalesces them and
+# rewrites the file atomically (temp file + one fsync + rename), so the
+# frame loop never touches disk.
+
+SAVE_FILE = "save.json"
+SAVE_VERSION = 1
+
+# key -> (type, default)
+SAVE_SCHEMA = {
+    "fish": (int, 0),
+    "highscore": (int, 0),
+    "owned_skins": (list, ["default"]),
+    "settings": (dict, {}),
+}
+
+# pre-JSON saves: one text file per value
+LEGACY_SAVE_FILES = {
+    "fish": "fish.txt",
+    "highscore": "highscore.txt",
+    "owned_skins": "owned_skins.txt",
+}
+
+WRITE_BEHIND_DELAY = 0.5  # seconds to wait for more writes before flushing
+
+log = logging.getLogger(__name__)
+
+
+def _atomic_write(path: str, text: str):
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def default_save_data() -> dict:
+    data = {key: copy.deepcopy(default) for key, (_, default) in SAVE_SCHEMA.items()}
+    data["version"] = SAVE_VERSION
+    return data
+
+
+def _parse_save_int(value) -> int:
+    """An int field from JSON or a legacy text file ("12", 12, 12.0)."""
+    if isinstance(value, bool):  # bool is an int subclass; true/false isn't a count
+        raise TypeError(value)
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        value = value.strip()
+        try:
+            return int(value)
+        except ValueError:
+            value = float(value)
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    raise ValueError(value)
+
+
+def validate_save_data(raw) -> dict:
+    """
+    Coerce a decoded save into the current schema.
+    Unknown keys are dropped, bad or missing values fall back to defaults.
+    """
+    data = default_save_data()
+    if not isinstance(raw, dict):
+        return data
+
+    for key, (kind, default) in SAVE_SCHEMA.items():
+        value = raw.get(key, default)
+        try:
+            if kind is int:
+                value = _parse_save_int(value)
+            elif kind is list:
+                if not isinstance(value, list):
+                    raise TypeError(value)
+                value = [v for v in value if isinstance(v, str) and v.strip()]
+            elif not isinstance(value, kind):
+                raise TypeError(value)
+        except (TypeError, ValueError):
+            value = copy.deepcopy(default)
+        data[key] = value
+
+    if "default" not in data["owned_skins"]:
+        data["owned_skins"].insert(0, "default")
+    return data
+
+
+def migrate_legacy_saves():
+    """
+    Build save data from the old fish.txt / highscore.txt / owned_skins.txt.
+    Returns None if none of them exist.
+    """
+    raw = {}
+    for key, filename in LEGACY_SAVE_FILES.items():
+        path = get_save_path(filename)
+        if not os.path.exists(path):
+            continue
+        try:
+            with open(path, "r") as f:
+                text = f.read()
+        except OSError:
+            continue
+
+        if key == "owned_skins":
+            raw[key] = [line.strip() for line in text.splitlines() if line.strip()]
+        else:
+            raw[key] = text.strip()
+
+    if not raw:
+        return None
+    return validate_save_data(raw)
+
+
+def read_save_file(path: str) -> dict:
+    """Read and validate the save file, migrating legacy saves if needed."""
     try:
         with open(path, "r") as f:
-            return int(f.read().strip())
-    except Exception:
-        return default
-
-
-def _save_int(filename: str, value: int):
-    path = get_save_path(filename)
-    with open(path, "w") as f:
-        f.write(str(int(value)))
+            raw = json.load(f)
+    except FileNotFoundError:
+        return migrate_legacy_saves() or default_save_data()
+    except (OSError, ValueError) as e:
+        # keep the bad file for recovery; the next flush must not replace it
+        bad_path = path + ".bad"
+        try:
+            os.replace(path, bad_path)
+            log.warning("unreadable save file %s (%s), moved to %s; starting fresh", path, e, bad_path)
+        except OSError as move_error:
+            log.warning("unreadable save file %s (%s), could not move it aside: %s", path, e, move_error)
+        return default_save_data()
+
+    # version steps go here when the schema changes (raw["version"] < SAVE_VERSION)
+    return validate_save_data(raw)
+
+
+def encode_save_data(data: dict) -> str:
+    return json.dumps(data, separators=(",", ":"), sort_keys=True)
+
+
+class SaveStore:
+    def __init__(self):
+        self._data = default_save_data()
+        self._path = None
+        self._dirty = False
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread = None
+
+    # ---------- loading ----------
+
+    def load(self):
+        """Read the save file once (creating/migrating it if missing)."""
+        self._path = get_save_path(SAVE_FILE)
+        existed = os.path.exists(self._path)
+        self._data = read_save_file(self._path)
+        if not existed:
+            _atomic_write(self._path, encode_save_data(self._data))
+
+        self._thread = threading.Thread(target=self._writer, name="save-writer", daemon=True)
+        self._thread.start()
+
+    # ---------- access (memory only) ----------
+
+    def get(self, key):
+        with self._cond:
+            return copy.deepcopy(self._data[key])
+
+    def set(self, key, value):
+        with self._cond:
+            self._data[key] = copy.deepcopy(value)
+            self._dirty = True
+            self._cond.notify()
+
+    # ---------- persistence ----------
+
+    def _take_dirty(self):
+        if not self._dirty:
+            return None
+        self._dirty = False
+        return encode_save_data(self._data)
+
+    def _write(self, text):
+        if text is None:
+            return
+        try:
+            _atomic_write(self._path, text)
+        except OSError as e:
+            log.warning("failed to write save file %s: %s", self._path, e)
+            # still pending: the writer thread retries, close() flushes again
+            with self._cond:
+                self._dirty = True
+
+    def _writer(self):
+        while True:
+            with self._cond:
+                while not self._dirty and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                # coalesce bursts of writes into one flush
+                self._cond.wait(WRITE_BEHIND_DELAY)
+                text = self._take_dirty()
+            self._write(text)
+
+    def flush(self):
+        """Write anything pending right now (call before exiting)."""
+        with self._cond:
+            text = self._take_dirty()
+        self._write(text)
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+        self.flush()
+
+
+_store = None
+
+
+def get_save_store() -> SaveStore:
+    global _store
+    if _store is None:
+        _store = SaveStore()
+        _store.load()
+        atexit.register(_store.close)
+    return _store
+
+
+def flush_saves():
+    """Persist pending writes and stop the writer thread."""
+    if _store is not None:
+        _store.close()
 
 
 # ===============================
@@ -102,33 +306,35 @@ def _save_int(filename: str, value: int):
 # ===============================
 
 def load_fish_total() -> int:
-    return _load_int("fish.txt", 0)
+    return get_save_store().get("fish")
 
 
 def save_fish_total(n: int):
-    _save_int("fish.txt", n)
+    get_save_store().set("fish", int(n))
 
 
 def load_highscore() -> int:
-    return _load_int("highscore.txt", 0)
+    return get_save_store().get("highscore")
 
 
 def save_highscore(score: int):
-    _save_int("highscore.txt", score)
+    get_save_store().set("highscore", int(score))
 
 
 def load_owned_skins() -> list[str]:
-    path = get_save_path("owned_skins.txt")
-    if not os.path.exists(path):
-        with open(path, "w") as f:
-            f.write("default")
-        return ["default"]
-
-    with open(path, "r") as f:
-        return [line.strip() for line in f if line.strip()]
+    return get_save_store().get("owned_skins")
 
 
 def save_owned_skins(skins: list[str]):
-    path = get_save_path("owned_skins.txt")
-    with open(path, "w") as f:
-        f.write("\n".join(skins))
+    get_save_store().set("owned_skins", list(skins))
+
+
+def load_setting(name: str, default=None):
+    return get_save_store().get("settings").get(name, default)
+
+
+def save_setting(name: str, value):
+    store = get_save_store()
+    settings = store.get("settings")
+    settings[name] = value
+    store.set("settings", settings)
@@ -0,0 +1,137 @@
+import random
+from abc import ABC, abstractmethod
+
+from spatial import SpatialHash
+
+
+# -------------------------
+# PLAYING world model
+# -------------------------
+class World:
+    """
+    Everything one PLAYING run simulates besides the snowball / flake
+    fields and snow patches (those live on GameState). Plain slots: read
+    and write attributes directly.
+    """
+
+    __slots__ = (
+        "penguin",
+        "sim_time",              # ms of simulated PLAYING time
+        "camera_x", "camera_y",
+        "prev_camera",           # (x, y) before the last tick (interpolation)
+        "prev_penguin",
+        "score", "score_timer", "new_high",
+        "spawn_timer",           # snowballs
+        "spawn_delay_bonus",
+        "fish_collected",
+        "shield_count",          # stacks up to 3
+        "mult_active",
+        "pending_patch",         # world rect of the patch being previewed, or None
+        "pickups",               # world-space index of pickups on the ground, keyed by kind name
+        "kinds",                 # PickupKind instances, in update order
+    )
+
+    def __init__(self, penguin, kinds):
+        self.penguin = penguin
+        self.sim_time = 0.0
+        self.camera_x = 0.0
+        self.camera_y = 0.0
+        self.prev_camera = (0.0, 0.0)
+        self.prev_penguin = (penguin.world_x, penguin.world_y)
+        self.score = 0
+        self.score_timer = 0
+        self.new_high = False
+        self.spawn_timer = 0
+        self.spawn_delay_bonus = 0
+        self.fish_collected = 0
+        self.shield_count = 0
+        self.mult_active = False
+        self.pending_patch = None
+        self.pickups = SpatialHash()
+        self.kinds = tuple(kinds)
+
+
+# -------------------------
+# GAME OVER attract mode
+# -------------------------
+class Attract:
+    """The auto-dodging penguin and its stream of pooled snowballs."""
+
+    __slots__ = ("penguin", "prev_penguin", "snowballs", "spawn_timer", "vy", "anchor_y", "bg_offset_x")
+
+    BG_SCROLL = 0.3  # px per tick, leftwards
+
+    def __init__(self, penguin):
+        self.penguin = penguin
+        self.prev_penguin = (penguin.world_x, penguin.world_y)  # before the last tick (interpolation)
+        self.snowballs = []
+        self.spawn_timer = 0
+        self.vy = 0.0
+        self.anchor_y = penguin.world_y
+        self.bg_offset_x = 0.0
+
+
+# -------------------------
+# Pickup kinds
+# -------------------------
+class PendingSpawn:
+    """A pickup about to appear at a world position (dim preview circle)."""
+
+    __slots__ = ("t0", "x", "y")
+
+    def __init__(self, t0, x, y):
+        self.t0 = t0
+        self.x = x
+        self.y = y
+
+
+class PickupKind(ABC):
+    """
+    One kind of pickup: its spawn rule, what collecting it does, and the
+    one instance that may be on the ground. GameState runs the same
+    update pass for every kind and the renderer the same draw pass, so a
+    new pickup only needs a subclass and a place in game.PICKUP_KINDS.
+
+    Subclasses set name (also the profiler / culling key) and implement
+    create(), due() and collect().
+    """
+
+    __slots__ = ("timer", "entity", "pending")
+
+    name = None
+    early = False          # updated before the patches / player (else after the player)
+    layer = "sprites"      # renderer layer: "ground" (under patches) or "sprites"
+    preview_ms = 0         # dim preview circle this long before it appears (0 = none)
+    preview_radius = 26
+    preview_margin = 60    # px kept clear of the view edges by preview_position()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # profiler section names, built once (not for unnamed base / mixin classes)
+        if cls.name is not None:
+            cls.update_section = f"update.{cls.name}"
+            cls.draw_section = f"draw.{cls.name}"
+
+    def __init__(self):
+        self.timer = 0
+        self.entity = None
+        self.pending = None
+
+    @abstractmethod
+    def create(self, screen):
+        """New entity; its world position is where it rolled on screen."""
+
+    @abstractmethod
+    def due(self, game, dt) -> bool:
+        """Advance the spawn timer; True when a new one should start spawning."""
+
+    def preview_position(self, game):
+        """World position of the preview circle (and of the entity after it): somewhere in view."""
+        world, screen, margin = game.world, game.screen, self.preview_margin
+        wx = world.camera_x + random.randint(margin, screen.width - margin)
+        wy = world.camera_y + random.randint(margin, screen.height - margin)
+        return wx, wy
+
+    @abstractmethod
+    def collect(self, game):
+        """Apply the pickup's effect (the entity is removed afterwards)."""